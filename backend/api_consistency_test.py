@@ -8,6 +8,7 @@ import asyncio
 from dotenv import load_dotenv
 from openai import OpenAI
 from faster_whisper import WhisperModel
+from test_common import run
 
 async def test_api_multiple_times(audio_path: str, num_tests: int = 3):
     """API를 여러 번 호출해서 일관성 확인"""
@@ -104,4 +105,4 @@ async def main():
     await test_api_multiple_times(audio_path, 5)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,20 @@
+"""
+테스트 스크립트 진입점용 이벤트 루프 실행 헬퍼
+httpx/openai/dotenv 없이도 임포트할 수 있도록 test_common과 분리
+"""
+import asyncio
+import sys
+
+# uvloop이 있으면 더 빠른 이벤트 루프 사용 (Windows 미지원)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def run(coro):
+    """테스트 진입점용 asyncio.run (uvloop이 있으면 uvloop 루프에서 실행)"""
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
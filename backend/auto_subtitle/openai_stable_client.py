@@ -5,11 +5,12 @@ temperature=0, seed, prompt 등을 활용한 결과 안정화
 import asyncio
 import os
 import tempfile
+from collections import Counter
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import aiofiles
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, RateLimitError, APITimeoutError, APIConnectionError
 import logging
 import hashlib
 
@@ -17,6 +18,12 @@ import hashlib
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 일시적 API 오류는 지수 백오프로 재시도 (0.5초 → 1초 → ... 최대 8초)
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
 class StableOpenAIWhisperClient:
     """일관된 결과를 위한 OpenAI Whisper API 클라이언트"""
     
@@ -63,6 +70,18 @@ class StableOpenAIWhisperClient:
         else:
             return "Please transcribe this audio accurately with proper punctuation and spacing."
     
+    async def _call_with_backoff(self, func):
+        """동기 API 호출을 스레드에서 실행, 속도 제한/타임아웃 시 지수 백오프 재시도"""
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return await asyncio.to_thread(func)
+            except RETRYABLE_ERRORS as e:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                delay = min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY)
+                logger.warning(f"⚠️ 일시적 API 오류, {delay:.1f}초 후 재시도: {e}")
+                await asyncio.sleep(delay)
+    
     async def transcribe_audio_stable(
         self, 
         audio_path: str, 
@@ -110,8 +129,8 @@ class StableOpenAIWhisperClient:
                     
                     return self.client.audio.transcriptions.create(**params)
             
-            # 비동기 API 호출
-            result = await asyncio.to_thread(_stable_api_call)
+            # 비동기 API 호출 (일시적 오류는 백오프 재시도)
+            result = await self._call_with_backoff(_stable_api_call)
             
             # 세그먼트 처리
             segments = []
@@ -151,40 +170,47 @@ class StableOpenAIWhisperClient:
         language: str = "ko",
         max_retries: int = 3
     ) -> Dict:
-        """재시도를 통한 일관된 결과 확보"""
-        results = []
+        """일치하는 결과가 두 번 나올 때까지 호출해 일관된 결과 확보
         
-        for attempt in range(max_retries):
-            logger.info(f"🔄 시도 {attempt + 1}/{max_retries}")
-            
-            result = await self.transcribe_audio_stable(audio_path, language)
-            
-            if result.get("success"):
-                results.append(result["text"])
-                
-                # 첫 번째 성공한 결과를 반환 (일관성을 위해)
-                if attempt == 0:
-                    logger.info("✅ 첫 번째 시도 성공, 결과 반환")
-                    return result
-                
-                # 이전 결과와 비교
-                if len(results) >= 2 and results[-1] == results[-2]:
-                    logger.info("✅ 일관된 결과 확인됨")
-                    return result
-            
-            # 실패시 잠시 대기
-            await asyncio.sleep(1)
+        먼저 2회 동시에 호출하고, 두 결과가 같으면 추가 호출 없이 채택 (유료 호출 2회).
+        다르면 일치하는 결과가 나오거나 max_retries회가 될 때까지 한 번씩 더 호출.
+        끝까지 일치하는 결과가 없으면 첫 번째 성공 결과를 경고와 함께 반환 (majority=False).
+        각 호출의 일시적 오류는 _call_with_backoff에서 재시도됨.
+        """
+        logger.info(f"🔄 최대 {max_retries}회 호출, 2회 일치하면 채택")
         
-        # 모든 시도 실패시 마지막 결과 반환
-        if results:
-            logger.warning("⚠️ 완전 일관된 결과는 얻지 못했지만 마지막 결과 반환")
-            return result
-        else:
+        results = list(await asyncio.gather(*(
+            self.transcribe_audio_stable(audio_path, language)
+            for _ in range(min(2, max_retries))
+        )))
+        
+        while True:
+            successful = [r for r in results if r.get("success")]
+            votes = Counter(r["text"] for r in successful)
+            if votes and votes.most_common(1)[0][1] >= 2:
+                break
+            if len(results) >= max_retries:
+                break
+            logger.warning(f"⚠️ 일치하는 결과 없음, 추가 호출 ({len(results) + 1}/{max_retries})")
+            results.append(await self.transcribe_audio_stable(audio_path, language))
+        
+        if not successful:
             return {
                 "success": False,
                 "error": "모든 재시도 실패",
                 "processing_method": "openai_api_stable"
             }
+        
+        text, count = votes.most_common(1)[0]
+        if count >= 2:
+            logger.info(f"✅ 일치하는 결과 확인됨 ({count}/{len(successful)})")
+            result = next(r for r in successful if r["text"] == text)
+        else:
+            # 모두 다르면 다수결이 아니므로 임의로 고르지 않고 첫 번째 결과 사용
+            logger.warning(f"⚠️ {len(successful)}개 결과가 모두 달라 첫 번째 결과 사용")
+            result = successful[0]
+        
+        return {**result, "majority": count >= 2, "votes": count, "vote_total": len(successful)}
 
 # 전역 인스턴스
 stable_openai_whisper_client = StableOpenAIWhisperClient()
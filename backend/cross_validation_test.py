@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 from openai import OpenAI
 import sys
 from collections import Counter
+from test_common import run
 
 # 환경변수 로드
 load_dotenv()
@@ -175,7 +176,7 @@ if __name__ == "__main__":
     print(f"📁 파일 정보: {os.path.basename(audio_path)} ({file_size/1024:.1f}KB)")
     
     # 비동기 실행
-    asyncio.run(cross_validation_test(audio_path))
+    run(cross_validation_test(audio_path))
     
     print("\n" + "="*60)
     print("🎉 교차 검증 완료!")
@@ -8,6 +8,7 @@ import asyncio
 import hashlib
 from dotenv import load_dotenv
 from openai import OpenAI
+from test_common import run
 
 class DirectStableAPITest:
     """직접 안정화 API 테스트"""
@@ -206,4 +207,4 @@ async def main():
         print("   → API는 속도가 우선인 경우에만 사용")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -57,8 +57,8 @@ async def api_status():
         gpt_available = False
         try:
             # 간단한 GPT 후처리 모듈 사용
-            from simple_gpt_postprocessor import simple_gpt_postprocessor
-            gpt_available = simple_gpt_postprocessor.is_available()
+            from simple_gpt_postprocessor import get_simple_gpt_postprocessor
+            gpt_available = get_simple_gpt_postprocessor().is_available()
         except ImportError as e:
             print(f"⚠️ GPT 후처리 모듈 임포트 실패: {e}")
             gpt_available = False 
@@ -280,7 +280,8 @@ async def generate_subtitles(
                 print("🤖 GPT 후처리로 오타 교정 중...")
                 
                 # 간단한 GPT 후처리 모듈 사용
-                from simple_gpt_postprocessor import simple_gpt_postprocessor
+                from simple_gpt_postprocessor import get_simple_gpt_postprocessor
+                simple_gpt_postprocessor = get_simple_gpt_postprocessor()
                 
                 if simple_gpt_postprocessor.is_available():
                     # 타임스탬프 보존 강화 버전 사용
@@ -11,13 +11,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 import os
+import re
+import functools
 import sys
 import shutil
 import subprocess
 import tempfile
 from pathlib import Path
 import uuid
-from typing import Optional, Dict, List
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
 import asyncio
 from datetime import datetime
 import json
@@ -25,7 +28,7 @@ from dotenv import load_dotenv
 
 # Phase 2 모듈 임포트
 from phase2_models import Phase2ModelManager, TranscriptionResult
-from phase2_streaming import StreamingTranscriber, StreamingProgress
+from phase2_streaming import StreamingTranscriber, StreamingProgress, start_queue_logging, stop_queue_logging
 from phase2_quality import QualityAnalyzer, AutoReprocessor
 from phase2_postprocessing import Phase2PostProcessor
 
@@ -65,6 +68,14 @@ app.mount("/outputs", StaticFiles(directory=str(OUTPUTS_DIR)), name="outputs")
 # 지원하는 오디오 형식
 SUPPORTED_AUDIO_FORMATS = {".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg"}
 
+# 조사로 끝난 채 줄바꿈되는 부자연스러운 분할점 ("내용을\n", "것을\n", "을\n" 등 - 한 번의 스캔으로 검사)
+_BAD_SPLIT_RE = re.compile(r"(?:내용을|것을|[을를에이가])\n")
+
+# GPT 스마트 분할 결과 캐시 - (텍스트, 최대 길이, 최대 줄 수) 기준 LRU
+# 반복되는 자막 문장("감사합니다" 등)은 API 재호출 없이 재사용
+LINE_BREAK_CACHE_SIZE = 512
+_line_break_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
 # 전역 매니저들
 model_manager: Optional[Phase2ModelManager] = None
 streaming_transcriber: Optional[StreamingTranscriber] = None
@@ -173,6 +184,13 @@ def seconds_to_ass_time(seconds: float) -> str:
     return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
 
 
+@functools.lru_cache(maxsize=1)
+def _get_openai_client():
+    """GPT 스마트 분할용 AsyncOpenAI 클라이언트 (프로세스 전체에서 하나의 커넥션 풀 공유)"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
 async def gpt_smart_line_breaks(text: str, max_line_length: int, max_lines: int = 2) -> str:
     """
     🤖 GPT 기반 의미 단위 스마트 분할
@@ -183,14 +201,17 @@ async def gpt_smart_line_breaks(text: str, max_line_length: int, max_lines: int
     if not api_available:
         return text
     
+    cache_key = (text, max_line_length, max_lines)
+    cached = _line_break_cache.get(cache_key)
+    if cached is not None:
+        _line_break_cache.move_to_end(cache_key)
+        return cached
+    
     try:
-        from openai import AsyncOpenAI
-        
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        if not os.getenv("OPENAI_API_KEY"):
             return text
             
-        client = AsyncOpenAI(api_key=api_key)
+        client = _get_openai_client()
         
         prompt = f"""다음 한국어 텍스트를 자연스럽고 의미있는 단위로 {max_lines}줄로 나누어 주세요.
 
@@ -204,23 +225,29 @@ async def gpt_smart_line_breaks(text: str, max_line_length: int, max_lines: int
 
 📝 텍스트: "{text}"
 
-✅ 결과: 줄바꿈으로 구분된 텍스트만 반환 (설명 없이)"""
+✅ 결과: JSON으로만 반환 (설명 없이) - {{"lines": ["첫 줄", "둘째 줄"]}}"""
 
+        # 답은 최대 max_lines줄이므로 출력 토큰을 그 길이에 맞게 제한 (+ JSON 구문 여유분)
         response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
-            max_tokens=1000
+            max_tokens=max_lines * max_line_length + 30,
+            response_format={"type": "json_object"}
         )
         
-        result = response.choices[0].message.content.strip()
+        data = json.loads(response.choices[0].message.content)
+        lines = [line.strip() for line in data.get("lines", []) if isinstance(line, str) and line.strip()]
+        result = '\n'.join(lines)
         
         # 결과 검증: 줄 수 및 길이 체크
-        lines = result.split('\n')
-        if len(lines) <= max_lines and all(len(line) <= max_line_length + 5 for line in lines):
+        if lines and len(lines) <= max_lines and all(len(line) <= max_line_length + 5 for line in lines):
             print(f"🤖 GPT 스마트 분할 성공: {len(lines)}줄")
             for i, line in enumerate(lines, 1):
                 print(f"   {i}줄: '{line}' (길이: {len(line)}자)")
+            _line_break_cache[cache_key] = result
+            if len(_line_break_cache) > LINE_BREAK_CACHE_SIZE:
+                _line_break_cache.popitem(last=False)
             return result
         else:
             print(f"⚠️ GPT 결과 검증 실패 - 원본 사용")
@@ -242,8 +269,9 @@ def needs_smart_improvement(text: str, formatted_result: str, max_line_length: i
     
     # 1. 너무 짧은 줄 검사
     for line in lines:
-        if len(line.strip()) <= 3 and len(line.strip()) > 0:
-            print(f"🔍 개선 필요: 너무 짧은 줄 감지 - '{line.strip()}'")
+        stripped = line.strip()
+        if 0 < len(stripped) <= 3:
+            print(f"🔍 개선 필요: 너무 짧은 줄 감지 - '{stripped}'")
             return True
     
     # 2. 줄 길이 불균형 검사 (2줄인 경우)
@@ -257,14 +285,10 @@ def needs_smart_improvement(text: str, formatted_result: str, max_line_length: i
                 return True
     
     # 3. 부자연스러운 분할점 검사
-    problem_patterns = [
-        "내용을\n", "것을\n", "을\n", "를\n", "에\n", "이\n", "가\n"
-    ]
-    
-    for pattern in problem_patterns:
-        if pattern in formatted_result:
-            print(f"🔍 개선 필요: 부자연스러운 분할점 감지 - '{pattern.strip()}'")
-            return True
+    match = _BAD_SPLIT_RE.search(formatted_result)
+    if match:
+        print(f"🔍 개선 필요: 부자연스러운 분할점 감지 - '{match.group(0).strip()}'")
+        return True
     
     return False
 
@@ -396,6 +420,27 @@ def create_video_with_subtitles(
 # 서버 시작시 초기화
 init_phase2_systems()
 
+# 로그 출력 리스너 (서버 시작 시 시작, 종료 시 정지)
+log_listener = None
+
+
+@app.on_event("startup")
+async def start_log_listener():
+    """로그 출력은 백그라운드 스레드에서 처리 (요청 처리 중 stdout 잠금 대기 방지)"""
+    global log_listener
+    log_listener = start_queue_logging()
+
+
+@app.on_event("shutdown")
+async def shutdown_phase2_systems():
+    """서버 종료시 공유 HTTP 커넥션 풀과 로그 리스너 정리"""
+    global log_listener
+    if model_manager:
+        await model_manager.aclose()
+    if log_listener:
+        stop_queue_logging(log_listener)
+        log_listener = None
+
 
 @app.get("/")
 async def root():
@@ -500,27 +545,25 @@ async def get_template_info_api(template_name: str):
         raise HTTPException(status_code=503, detail="Template manager not available")
     
     try:
-        info = template_manager.get_template_info(template_name)
+        # 실제 비디오 길이/경로까지 한 번에 조회
+        info = template_manager.resolve(template_name)
         if not info:
             raise HTTPException(status_code=404, detail=f"템플릿 '{template_name}'을 찾을 수 없습니다")
         
-        # 실제 비디오 길이 감지
-        duration = template_manager.get_template_duration(template_name)
-        
         return {
             "template_name": template_name,
             "info": {
                 "name": info.name,
                 "description": info.description,
                 "category": info.category,
-                "duration": duration,  # 실제 감지된 길이
+                "duration": info.duration,  # 실제 감지된 길이
                 "resolution": info.resolution,
                 "preview_image": info.preview_image,
                 "recommended_for": info.recommended_for,
                 "created_at": info.created_at
             },
             "available": template_manager.validate_template(template_name),
-            "path": template_manager.get_template_path(template_name)
+            "path": info.path
         }
     
     except HTTPException:
@@ -1048,7 +1091,9 @@ async def test_smart_line_breaks():
         }
     ]
     
-    results = []
+    # 1) A방식 적용과 문제점 감지는 케이스 순서대로 (출력 순서 유지)
+    basic_results = []
+    needs_flags = []
     
     for case in problem_cases:
         print(f"\n🧪 테스트: {case['name']}")
@@ -1057,15 +1102,27 @@ async def test_smart_line_breaks():
         
         # A방식 (기존) 적용
         basic_result = apply_word_based_line_breaks(case['text'], case['max_length'])
+        basic_results.append(basic_result)
         
         # 문제점 감지
-        needs_improvement = needs_smart_improvement(case['text'], basic_result, case['max_length'])
-        
-        # GPT 스마트 분할 적용 (필요시)
-        smart_result = basic_result
+        needs_flags.append(needs_smart_improvement(case['text'], basic_result, case['max_length']))
+    
+    # 2) GPT 스마트 분할은 서로 독립적이므로 필요한 케이스만 동시에 요청
+    async def run_case(case: Dict, basic_result: str, needs_improvement: bool) -> str:
         if needs_improvement:
-            smart_result = await gpt_smart_line_breaks(case['text'], case['max_length'])
-        
+            return await gpt_smart_line_breaks(case['text'], case['max_length'])
+        return basic_result
+    
+    smart_results = await asyncio.gather(*(
+        run_case(case, basic_result, needs_improvement)
+        for case, basic_result, needs_improvement in zip(problem_cases, basic_results, needs_flags)
+    ))
+    
+    results = []
+    
+    for case, basic_result, needs_improvement, smart_result in zip(
+        problem_cases, basic_results, needs_flags, smart_results
+    ):
         basic_lines = basic_result.split('\n')
         smart_lines = smart_result.split('\n')
         
@@ -1247,4 +1304,15 @@ if __name__ == "__main__":
     print("  🔄 자동 재처리 시스템")
     print("  📡 WebSocket 실시간 업데이트")
     print(f"🌐 API 상태: {'사용 가능' if api_available else 'API 키 필요'}")
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    
+    # uvloop이 설치되어 있으면 더 빠른 이벤트 루프 사용 (Windows 미지원)
+    event_loop = "asyncio"
+    if sys.platform != "win32":
+        try:
+            import uvloop  # noqa: F401
+            event_loop = "uvloop"
+        except ImportError:
+            pass
+    print(f"⚡ 이벤트 루프: {event_loop}")
+    
+    uvicorn.run(app, host="0.0.0.0", port=8002, loop=event_loop)
@@ -8,10 +8,23 @@
 import asyncio
 import time
 import json
-from typing import Dict, List, Optional, Any
-from openai import OpenAI, AsyncOpenAI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Union, BinaryIO
+from openai import OpenAI
 from dataclasses import dataclass
 import statistics
+import httpx
+
+# h2 패키지가 있으면 HTTP/2로 여러 청크 업로드를 하나의 연결에 다중화
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 모든 전사 요청이 공유하는 커넥션 풀 설정
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
 
 
 @dataclass
@@ -59,19 +72,40 @@ class Phase2ModelManager:
         }
     }
     
-    def __init__(self, api_key: str):
-        """초기화"""
-        self.client = OpenAI(api_key=api_key)
-        self.async_client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, max_api_workers: int = 16):
+        """
+        초기화
+        Args:
+            max_api_workers: 동기 전사 API 호출 전용 스레드 수 (기본 executor와 분리)
+        """
+        # 하나의 커넥션 풀을 계속 재사용 (청크마다 TLS 핸드셰이크 반복 방지)
+        self._http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+        )
+        self.client = OpenAI(api_key=api_key, http_client=self._http_client)
+        
+        # 업로드/응답 파싱은 전용 스레드 풀에서 실행 (이벤트 루프와 기본 executor를 막지 않음)
+        self._api_executor = ThreadPoolExecutor(
+            max_workers=max_api_workers, thread_name_prefix="openai-api"
+        )
+    
+    async def aclose(self):
+        """공유 HTTP 커넥션 풀과 API 스레드 풀 정리"""
+        self._api_executor.shutdown(wait=False, cancel_futures=True)
+        self._http_client.close()
         
     async def transcribe_with_model(
         self, 
-        audio_path: str, 
+        audio_path: Union[str, BinaryIO], 
         model_config: str = "whisper-1-optimized",
         language: str = "ko",
         include_quality_metrics: bool = True
     ) -> TranscriptionResult:
-        """특정 모델 구성으로 전사"""
+        """
+        특정 모델 구성으로 전사
+        Args:
+            audio_path: 오디오 파일 경로 또는 메모리 버퍼 (io.BytesIO 등, 확장자가 포함된 name 속성 필요)
+        """
         
         start_time = time.time()
         
@@ -108,13 +142,22 @@ class Phase2ModelManager:
             }
             
             def _api_call():
+                # 메모리 버퍼는 임시 파일 없이 그대로 업로드
+                if not isinstance(audio_path, str):
+                    audio_path.seek(0)
+                    return self.client.audio.transcriptions.create(
+                        file=audio_path,
+                        **params
+                    )
+                
                 with open(audio_path, "rb") as audio_file:
                     return self.client.audio.transcriptions.create(
                         file=audio_file,
                         **params
                     )
             
-            result = await asyncio.to_thread(_api_call)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._api_executor, _api_call)
             processing_time = time.time() - start_time
             
             # 세그먼트 처리
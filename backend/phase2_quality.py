@@ -10,7 +10,7 @@ import json
 import time
 import statistics
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 import re
 import math
@@ -36,7 +36,20 @@ class QualityMetrics:
     # 추천사항
     needs_reprocessing: bool
     recommended_model: Optional[str]
-    improvement_suggestions: List[str]
+    # (템플릿, 인자) 형태로 보관 - 문자열은 실제로 필요할 때만 생성
+    suggestion_templates: List[Tuple[str, tuple]] = field(default_factory=list, repr=False)
+    
+    @property
+    def improvement_suggestions(self) -> List[str]:
+        """개선 제안 문자열 목록"""
+        return [template.format(*args) for template, args in self.suggestion_templates]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화용 딕셔너리 (개선 제안 문자열은 여기서 생성)"""
+        data = asdict(self)
+        del data["suggestion_templates"]
+        data["improvement_suggestions"] = self.improvement_suggestions
+        return data
 
 
 @dataclass
@@ -180,6 +193,17 @@ class QualityAnalyzer:
     ) -> QualityMetrics:
         """전사 품질 종합 분석"""
         
+        return self._analyze_sync(text, segments, processing_time, model_used)
+    
+    def _analyze_sync(
+        self,
+        text: str,
+        segments: List[Dict],
+        processing_time: float,
+        model_used: str
+    ) -> QualityMetrics:
+        """전사 품질 종합 분석 (동기 버전 - asyncio.to_thread로 병렬 실행 가능)"""
+        
         start_time = time.time()
         
         # 1. 기본 메트릭 계산
@@ -242,7 +266,7 @@ class QualityAnalyzer:
             
             needs_reprocessing=needs_reprocessing,
             recommended_model=recommended_model,
-            improvement_suggestions=improvement_suggestions
+            suggestion_templates=improvement_suggestions
         )
     
     def _calculate_completeness_score(self, segments: List[Dict], text: str) -> float:
@@ -363,25 +387,25 @@ class QualityAnalyzer:
         confidence: float,
         korean_analysis: Dict[str, float],
         low_confidence_segments: int
-    ) -> List[str]:
-        """개선 제안 생성"""
+    ) -> List[Tuple[str, tuple]]:
+        """개선 제안 생성 (문자열 포맷팅은 QualityMetrics에서 지연 처리)"""
         
         suggestions = []
         
         if confidence < 0.7:
-            suggestions.append("신뢰도가 낮습니다. 더 높은 품질의 모델을 사용해보세요.")
+            suggestions.append(("신뢰도가 낮습니다. 더 높은 품질의 모델을 사용해보세요.", ()))
         
         if korean_analysis["korean_ratio"] < 0.8:
-            suggestions.append("한국어 비율이 낮습니다. 언어 설정을 확인하고 한국어 특화 프롬프트를 사용해보세요.")
+            suggestions.append(("한국어 비율이 낮습니다. 언어 설정을 확인하고 한국어 특화 프롬프트를 사용해보세요.", ()))
         
         if korean_analysis["grammar_score"] < 0.6:
-            suggestions.append("문법 점수가 낮습니다. GPT 후처리를 통한 교정을 권장합니다.")
+            suggestions.append(("문법 점수가 낮습니다. GPT 후처리를 통한 교정을 권장합니다.", ()))
         
         if low_confidence_segments > 0:
-            suggestions.append(f"{low_confidence_segments}개 세그먼트의 신뢰도가 낮습니다. 해당 구간을 재처리해보세요.")
+            suggestions.append(("{}개 세그먼트의 신뢰도가 낮습니다. 해당 구간을 재처리해보세요.", (low_confidence_segments,)))
         
         if overall_score < 0.6:
-            suggestions.append("전체적인 품질이 낮습니다. 오디오 파일의 품질을 확인하거나 다른 모델을 시도해보세요.")
+            suggestions.append(("전체적인 품질이 낮습니다. 오디오 파일의 품질을 확인하거나 다른 모델을 시도해보세요.", ()))
         
         return suggestions
 
@@ -389,10 +413,109 @@ class QualityAnalyzer:
 class AutoReprocessor:
     """자동 재처리 시스템"""
     
+    # 품질이 애매할 때 동시에 시도해볼 후보 모델들
+    REPROCESS_CANDIDATES = ("whisper-1", "gpt-4o-audio-preview")
+    
     def __init__(self, model_manager, quality_analyzer: QualityAnalyzer):
         self.model_manager = model_manager
         self.quality_analyzer = quality_analyzer
         self.max_reprocess_attempts = 2
+        self.borderline_margin = 0.1  # 목표 품질과의 차이가 이 이하면 "애매한" 품질로 판단
+    
+    async def _analyze_result(self, result: Dict) -> QualityMetrics:
+        """전사 결과 품질 분석 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        return await asyncio.to_thread(
+            self.quality_analyzer._analyze_sync,
+            result.get("text", ""),
+            result.get("segments", []),
+            result.get("processing_time", 0),
+            result.get("model_used", "unknown")
+        )
+    
+    def _candidate_models(
+        self,
+        quality: QualityMetrics,
+        current_model: str,
+        target_quality: float
+    ) -> List[str]:
+        """재처리 후보 모델 목록 (애매한 품질이면 대안 모델도 함께 시도)"""
+        
+        candidates = [quality.recommended_model]
+        
+        if target_quality - quality.overall_score <= self.borderline_margin:
+            for model in self.REPROCESS_CANDIDATES:
+                if model not in candidates and model != current_model:
+                    candidates.append(model)
+        
+        return candidates
+    
+    async def _reprocess_candidate(
+        self,
+        audio_path: str,
+        model: str,
+        attempt: int
+    ) -> Tuple[Dict, Optional[QualityMetrics]]:
+        """후보 모델 하나로 재처리 후 품질 분석"""
+        
+        reprocess_result = await self.model_manager.transcribe_with_model(
+            audio_path,
+            model,
+            "ko",
+            include_quality_metrics=True
+        )
+        
+        if not reprocess_result.success:
+            return {"model_used": model, "error": reprocess_result.error}, None
+        
+        result = {
+            "text": reprocess_result.text,
+            "segments": reprocess_result.segments,
+            "processing_time": reprocess_result.processing_time,
+            "model_used": reprocess_result.model_used,
+            "reprocessed": True,
+            "reprocess_attempt": attempt + 1
+        }
+        
+        return result, await self._analyze_result(result)
+    
+    async def _reprocess_concurrently(
+        self,
+        audio_path: str,
+        models: List[str],
+        attempt: int,
+        target_quality: float
+    ) -> Tuple[Optional[Dict], Optional[QualityMetrics]]:
+        """후보 모델들을 동시에 재처리하고 가장 높은 점수의 결과 선택"""
+        
+        tasks = [
+            asyncio.create_task(self._reprocess_candidate(audio_path, model, attempt))
+            for model in models
+        ]
+        
+        best_result, best_quality = None, None
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result, quality = await next_done
+                
+                if quality is None:
+                    print(f"❌ 재처리 실패 ({result['model_used']}): {result['error']}")
+                    continue
+                
+                print(f"📊 {result['model_used']} 재처리 품질: {quality.overall_score:.3f}")
+                
+                if best_quality is None or quality.overall_score > best_quality.overall_score:
+                    best_result, best_quality = result, quality
+                
+                # 목표를 넘긴 결과가 나오면 나머지 후보는 기다리지 않음
+                if quality.overall_score >= target_quality:
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        return best_result, best_quality
     
     async def auto_reprocess_if_needed(
         self,
@@ -405,20 +528,14 @@ class AutoReprocessor:
         current_result = initial_result
         attempt = 0
         
+        # 품질 분석
+        quality = await self._analyze_result(current_result)
+        
         while attempt < self.max_reprocess_attempts:
-            # 품질 분석
-            quality = await self.quality_analyzer.analyze_transcription_quality(
-                current_result.get("text", ""),
-                current_result.get("segments", []),
-                current_result.get("processing_time", 0),
-                current_result.get("model_used", "unknown")
-            )
-            
             print(f"🔍 품질 점수: {quality.overall_score:.3f} (목표: {target_quality:.3f})")
             
             # 목표 품질 달성시 종료
             if quality.overall_score >= target_quality:
-                current_result["quality_metrics"] = asdict(quality)
                 print("✅ 목표 품질 달성!")
                 break
             
@@ -429,42 +546,27 @@ class AutoReprocessor:
             
             # 다른 모델로 재처리 시도
             if quality.recommended_model:
-                print(f"🔄 {quality.recommended_model} 모델로 재처리 시도...")
+                models = self._candidate_models(
+                    quality, current_result.get("model_used", "unknown"), target_quality
+                )
+                print(f"🔄 {', '.join(models)} 모델로 재처리 시도...")
                 
-                reprocess_result = await self.model_manager.transcribe_with_model(
-                    audio_path,
-                    quality.recommended_model,
-                    "ko",
-                    include_quality_metrics=True
+                best_result, best_quality = await self._reprocess_concurrently(
+                    audio_path, models, attempt, target_quality
                 )
                 
-                if reprocess_result.success:
-                    current_result = {
-                        "text": reprocess_result.text,
-                        "segments": reprocess_result.segments,
-                        "processing_time": reprocess_result.processing_time,
-                        "model_used": reprocess_result.model_used,
-                        "reprocessed": True,
-                        "reprocess_attempt": attempt + 1
-                    }
-                else:
-                    print(f"❌ 재처리 실패: {reprocess_result.error}")
+                if best_result is None:
                     break
+                
+                current_result, quality = best_result, best_quality
             else:
                 print("⚠️ 추천할 대안 모델이 없습니다.")
                 break
             
             attempt += 1
         
-        # 최종 품질 분석
-        final_quality = await self.quality_analyzer.analyze_transcription_quality(
-            current_result.get("text", ""),
-            current_result.get("segments", []),
-            current_result.get("processing_time", 0),
-            current_result.get("model_used", "unknown")
-        )
-        
-        current_result["quality_metrics"] = asdict(final_quality)
+        # 최종 품질 (마지막 분석 결과 재사용)
+        current_result["quality_metrics"] = quality.to_dict()
         current_result["total_reprocess_attempts"] = attempt
         
         return current_result
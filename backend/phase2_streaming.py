@@ -6,184 +6,694 @@
 """
 
 import asyncio
+import bisect
+import functools
+import io
 import json
+import logging
+import logging.handlers
+import queue
+import subprocess
+import sys
 import time
-import tempfile
 import os
-from typing import Dict, List, Optional, AsyncGenerator, Callable
-from pathlib import Path
+import math
+from typing import Dict, List, Optional, AsyncGenerator, Awaitable, Callable, Tuple
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, replace
 
-# pydub 관련 임포트를 try-except로 처리
+logger = logging.getLogger(__name__)
+
+# orjson이 있으면 진행 상황 직렬화에 사용 (dataclass를 C 레벨에서 바로 직렬화)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# mutagen은 헤더만 읽어서 길이를 구할 수 있음 (없으면 ffprobe 사용)
 try:
-    from pydub import AudioSegment
-    from pydub.silence import split_on_silence
-    PYDUB_AVAILABLE = True
+    import mutagen
+    MUTAGEN_AVAILABLE = True
 except ImportError:
-    print("⚠️ pydub를 사용할 수 없습니다. 기본 청킹 방식을 사용합니다.")
-    PYDUB_AVAILABLE = False
+    MUTAGEN_AVAILABLE = False
+
+
+def start_queue_logging() -> logging.handlers.QueueListener:
+    """
+    루트 로거의 핸들러를 백그라운드 스레드로 옮김
+    (이벤트 루프 스레드는 큐에 넣기만 하고, 포맷팅/출력은 리스너 스레드가 담당)
+    """
+    root = logging.getLogger()
+    # 아직 출력 핸들러가 없으면 기본 콘솔 핸들러부터 설정
+    # (빈 핸들러로 리스너를 만들면 ERROR를 포함한 모든 로그가 버려짐)
+    if not root.handlers:
+        logging.basicConfig(level=logging.INFO)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, *root.handlers, respect_handler_level=True
+    )
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
 
 
-@dataclass 
+def stop_queue_logging(listener: logging.handlers.QueueListener):
+    """남은 로그를 모두 출력하고 루트 로거의 원래 핸들러 복원 (start_queue_logging의 반대)"""
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
+@functools.lru_cache(maxsize=128)
+def _probe_duration(audio_path: str, mtime_ns: int) -> float:
+    """오디오 길이 감지 (파일 경로 + 수정 시각 기준으로 캐시)"""
+    
+    if MUTAGEN_AVAILABLE:
+        try:
+            audio_file = mutagen.File(audio_path)
+            if audio_file is not None and audio_file.info.length > 0:
+                return float(audio_file.info.length)
+        except Exception:
+            pass
+    
+    cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
+           '-of', 'csv=p=0', audio_path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+
+def get_audio_duration(audio_path: str) -> float:
+    """오디오 길이 구하기 (실패시 기본값 60초)"""
+    try:
+        return _probe_duration(audio_path, os.stat(audio_path).st_mtime_ns)
+    except Exception:
+        return 60.0  # 기본값
+
+
+@dataclass(slots=True, frozen=True)
 class StreamingProgress:
     """스트리밍 진행 상황"""
     total_chunks: int
     processed_chunks: int
     current_chunk: int
     progress_percent: float
-    current_text: str
+    current_text: str  # "processing": 직전 전송 이후 끝난 청크들의 텍스트, "completed": 전체 텍스트
     estimated_remaining_time: float
-    status: str  # "processing", "completed", "error"
+    status: str  # "chunking", "processing", "completed", "error", "cancelled"
     error_message: Optional[str] = None
+    
+    def to_json(self) -> bytes:
+        """WebSocket 전송용 JSON 직렬화 (asdict 깊은 복사 없이)"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self)
+        data = {name: getattr(self, name) for name in self.__slots__}
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StreamingChunk:
     """스트리밍 청크 데이터"""
     chunk_id: int
     start_time: float
     end_time: float
-    audio_data: bytes
+    audio_source: Callable[[], Awaitable[bytes]]  # 호출할 때 구간을 잘라 바이트 반환 (미리 들고 있지 않음)
+    audio_format: str = "wav"  # 오디오 컨테이너 형식 (업로드 파일 확장자)
     text: Optional[str] = None
     confidence: Optional[float] = None
     processing_time: Optional[float] = None
 
 
+@dataclass(slots=True)
+class StreamingSession:
+    """스트리밍 세션 상태 (진행 카운터는 _emit_progress가 주기적으로 읽음)"""
+    status: str  # "chunking", "processing", "completed", "error", "cancelled"
+    start_time: float
+    model: str
+    total_chunks: int = 0
+    processed_chunks: int = 0
+    current_chunk: int = 0
+    estimated_remaining_time: float = 0.0
+    pending_texts: Dict[int, str] = field(default_factory=dict)  # 아직 전송하지 않은 청크 텍스트
+    worker: Optional[asyncio.Task] = None  # 전사 백그라운드 작업 (취소용)
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+
+
 class AudioChunker:
     """오디오 청킹 시스템"""
     
-    def __init__(self, chunk_duration: float = 30.0, overlap: float = 2.0):
+    # 재인코딩 없이 스트림 복사(-c copy)로 잘라도 API가 받는 형식: 확장자 -> FFmpeg 출력 포맷
+    # (m4a/mp4는 파이프 출력 시 moov 위치 문제로 제외하고 WAV로 디코딩)
+    STREAM_COPY_FORMATS = {
+        ".wav": "wav",
+        ".mp3": "mp3",
+        ".ogg": "ogg",
+    }
+    
+    def __init__(
+        self,
+        chunk_duration: float = 30.0,
+        overlap: float = 2.0,
+        io_semaphore: Optional[asyncio.Semaphore] = None,
+        split_on_silence: bool = True,
+        silence_thresh_db: float = -35.0,
+        min_silence_len: float = 0.4,
+        opus_bitrate: Optional[str] = "24k"
+    ):
         """
         초기화
         Args:
             chunk_duration: 청크 길이 (초)
-            overlap: 청크 간 겹침 (초)
+            overlap: 청크 간 겹침 (초, 무음 구간에서 자를 수 없을 때만 사용)
+            io_semaphore: 여러 세션이 공유하는 FFmpeg 프로세스 수 제한 (없으면 제한 없음)
+            split_on_silence: 무음 구간을 찾아 그 지점에서 청크를 나눌지 여부
+            silence_thresh_db: 무음으로 판단할 음량 기준 (dBFS)
+            min_silence_len: 무음으로 판단할 최소 길이 (초)
+            opus_bitrate: 디코딩한 청크를 Opus(OGG)로 압축할 비트레이트 (None이면 WAV 그대로)
         """
         self.chunk_duration = chunk_duration
         self.overlap = overlap
+        self.io_semaphore = io_semaphore
+        self.split_on_silence = split_on_silence
+        self.silence_thresh_db = silence_thresh_db
+        self.min_silence_len = min_silence_len
+        self.opus_bitrate = opus_bitrate
     
-    async def chunk_audio_file(self, audio_path: str) -> List[StreamingChunk]:
-        """오디오 파일을 청크로 분할 (간단한 시간 기반 방식)"""
+    async def chunk_audio_file(
+        self,
+        audio_path: str,
+        bounds: Optional[List[Tuple[float, float]]] = None
+    ) -> AsyncGenerator[StreamingChunk, None]:
+        """오디오 파일을 청크로 분할 (잘리는 대로 순서대로 하나씩 반환)"""
         
         try:
-            if PYDUB_AVAILABLE:
-                return await self._chunk_with_pydub(audio_path)
-            else:
-                return await self._chunk_simple(audio_path)
+            if bounds is None:
+                bounds = await self.plan_chunks(audio_path)
+            async for chunk in self._chunk_with_ffmpeg(audio_path, bounds):
+                yield chunk
         except Exception as e:
-            print(f"❌ 오디오 청킹 실패: {str(e)}")
+            logger.error(f"❌ 오디오 청킹 실패: {str(e)}")
             raise
     
-    async def _chunk_simple(self, audio_path: str) -> List[StreamingChunk]:
-        """간단한 시간 기반 청킹 (pydub 없이)"""
+    async def plan_chunks(self, audio_path: str) -> List[Tuple[float, float]]:
+        """청크 구간 계산 (오디오를 자르지 않음) - 가능하면 무음 지점에서 나눔"""
         
-        # ffprobe를 사용해서 오디오 길이 구하기
-        try:
-            import subprocess
-            cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-                   '-of', 'csv=p=0', audio_path]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            total_duration = float(result.stdout.strip())
-        except:
-            total_duration = 60.0  # 기본값
-        
-        chunks = []
-        chunk_id = 0
+        total_duration = get_audio_duration(audio_path)
+        
+        if self.split_on_silence and total_duration > self.chunk_duration:
+            try:
+                cut_points = await self._detect_silences(audio_path)
+                if cut_points:
+                    return self._silence_bounds(total_duration, cut_points)
+            except Exception as e:
+                logger.warning(f"⚠️ 무음 감지 실패, 고정 길이로 청킹: {str(e)}")
+        
+        return self._chunk_bounds(total_duration)
+    
+    async def _detect_silences(self, audio_path: str) -> List[float]:
+        """FFmpeg silencedetect로 무음 구간을 찾아 각 구간의 중간 지점 목록 반환"""
+        
+        cmd = [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', audio_path,
+            '-vn',
+            '-af', f'silencedetect=noise={self.silence_thresh_db}dB:d={self.min_silence_len}',
+            '-f', 'null', '-'
+        ]
+        
+        async def _run() -> bytes:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise RuntimeError(f"FFmpeg 무음 감지 실패: {stderr.decode(errors='ignore')}")
+            return stderr
+        
+        if self.io_semaphore is not None:
+            async with self.io_semaphore:
+                stderr = await _run()
+        else:
+            stderr = await _run()
+        
+        # "silence_start: 12.3" / "silence_end: 13.1 | silence_duration: 0.8" 로그 파싱
+        cut_points = []
+        silence_start = None
+        for line in stderr.decode(errors='ignore').splitlines():
+            if 'silence_start:' in line:
+                silence_start = float(line.split('silence_start:')[1].split()[0])
+            elif 'silence_end:' in line and silence_start is not None:
+                silence_end = float(line.split('silence_end:')[1].split()[0])
+                cut_points.append((max(silence_start, 0.0) + silence_end) / 2)
+                silence_start = None
+        
+        return cut_points
+    
+    def _silence_bounds(self, total_duration: float, cut_points: List[float]) -> List[Tuple[float, float]]:
+        """
+        무음 지점들을 chunk_duration 이하 청크로 묶음 (겹침 없음)
+        청크 안에 쓸 만한 무음 지점이 없으면 고정 길이 + 겹침으로 자름
+        """
+        
+        bounds = []
         start_time = 0.0
+        min_chunk = self.chunk_duration / 2  # 너무 짧은 청크 방지
         
-        print(f"🎵 오디오 총 길이: {total_duration:.1f}초 (간단한 청킹)")
-        print(f"📊 청크 크기: {self.chunk_duration}초, 겹침: {self.overlap}초")
+        while total_duration - start_time > self.chunk_duration:
+            limit = start_time + self.chunk_duration
+            # limit 이하에서 가장 늦은 무음 지점
+            idx = bisect.bisect_right(cut_points, limit) - 1
+            
+            if idx >= 0 and cut_points[idx] > start_time + min_chunk:
+                end_time = cut_points[idx]
+                bounds.append((start_time, end_time))
+                start_time = end_time
+            else:
+                bounds.append((start_time, limit))
+                start_time = limit - self.overlap
+        
+        bounds.append((start_time, total_duration))
+        return bounds
+    
+    def _chunk_bounds(self, total_duration: float) -> List[Tuple[float, float]]:
+        """청크 구간 (시작, 끝) 목록 계산 (겹침 고려)"""
+        
+        bounds = []
+        start_time = 0.0
         
         while start_time < total_duration:
             end_time = min(start_time + self.chunk_duration, total_duration)
+            bounds.append((start_time, end_time))
             
-            # 실제 오디오 파일을 그대로 사용 (청킹하지 않고)
-            with open(audio_path, 'rb') as f:
-                audio_data = f.read()
+            # 마지막 청크인 경우 종료
+            if end_time >= total_duration:
+                break
             
-            chunk = StreamingChunk(
+            # 다음 청크 시작점 (겹침 고려)
+            start_time = end_time - self.overlap
+        
+        return bounds
+    
+    async def _chunk_with_ffmpeg(
+        self,
+        audio_path: str,
+        bounds: List[Tuple[float, float]]
+    ) -> AsyncGenerator[StreamingChunk, None]:
+        """FFmpeg 파이프로 필요한 구간만 잘라내는 청킹 (전체 파일을 메모리에 올리지 않음)"""
+        
+        total_duration = bounds[-1][1] if bounds else 0.0
+        
+        logger.info("🎵 오디오 총 길이: %.1f초, 청크 %d개 (최대 %s초)",
+                    total_duration, len(bounds), self.chunk_duration)
+        
+        # 이미 PCM/압축 형식이면 디코딩+재인코딩 없이 스트림 복사
+        copy_format = self.STREAM_COPY_FORMATS.get(os.path.splitext(audio_path)[1].lower())
+        if copy_format == "wav" and self.opus_bitrate:
+            copy_format = None  # PCM은 복사보다 Opus로 압축하는 편이 업로드량이 훨씬 적음
+        audio_format = copy_format or ("ogg" if self.opus_bitrate else "wav")
+        
+        # 구간 정보만 담아 바로 내보내고, 실제 추출은 전사 직전에 수행
+        # (동시에 메모리에 있는 청크 바이트가 전체 청크 수가 아닌 동시 전사 수로 제한됨)
+        chunk_count = 0
+        for chunk_id, (start_time, end_time) in enumerate(bounds):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  📦 청크 %d: %.1fs - %.1fs", chunk_id, start_time, end_time)
+            
+            yield StreamingChunk(
                 chunk_id=chunk_id,
                 start_time=start_time,
                 end_time=end_time,
-                audio_data=audio_data  # 전체 파일 사용
+                audio_source=functools.partial(
+                    self._load_slice, audio_path, start_time, end_time - start_time, copy_format
+                ),
+                audio_format=audio_format
             )
+            chunk_count += 1
+        
+        logger.info("✅ 총 %d개 청크 생성 완료", chunk_count)
+    
+    async def _load_slice(
+        self,
+        audio_path: str,
+        start: float,
+        duration: float,
+        copy_format: Optional[str]
+    ) -> bytes:
+        """FFmpeg 프로세스 수 제한을 지키면서 구간 추출"""
+        
+        if self.io_semaphore is not None:
+            async with self.io_semaphore:
+                return await self._slice_with_ffmpeg(audio_path, start, duration, copy_format)
+        return await self._slice_with_ffmpeg(audio_path, start, duration, copy_format)
+    
+    async def _slice_with_ffmpeg(
+        self,
+        audio_path: str,
+        start: float,
+        duration: float,
+        copy_format: Optional[str] = None
+    ) -> bytes:
+        """
+        FFmpeg로 지정 구간만 잘라서 반환
+        copy_format이 있으면 스트림 복사(재인코딩 없음), 없으면 16kHz 모노로 디코딩 후
+        Opus(OGG) 또는 WAV로 출력
+        """
+        
+        cmd = [
+            'ffmpeg', '-v', 'error',
+            '-ss', str(start),
+            '-t', str(duration),
+            '-i', audio_path,
+            '-vn'
+        ]
+        
+        if copy_format:
+            cmd += ['-c:a', 'copy', '-f', copy_format]
+        else:
+            cmd += [
+                '-ac', '1',       # 모노 (음성 인식에 충분)
+                '-ar', '16000',   # Whisper 입력 샘플레이트
+            ]
+            if self.opus_bitrate:
+                # PCM16 대비 수십 배 작음 (음성 인식 품질 손실은 미미)
+                cmd += ['-c:a', 'libopus', '-b:a', self.opus_bitrate, '-f', 'ogg']
+            else:
+                cmd += ['-f', 'wav']
+        cmd.append('pipe:1')
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        audio_data, stderr = await process.communicate()
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg 구간 추출 실패: {stderr.decode(errors='ignore')}")
+        
+        return audio_data
+
+
+# 청크 하나의 세그먼트 (시작 시간 배열, 끝 시간 배열, 원본 세그먼트 목록)
+ChunkSegments = Tuple[np.ndarray, np.ndarray, List[Dict]]
+
+
+class StreamingTranscriber:
+    """실시간 스트리밍 전사기"""
+    
+    def __init__(
+        self,
+        model_manager,
+        chunk_duration: float = 30.0,
+        max_concurrency: int = 8,
+        max_ffmpeg_processes: int = 16,
+        progress_interval: float = 0.1
+    ):
+        """
+        초기화
+        Args:
+            model_manager: 전사에 사용할 모델 매니저
+            chunk_duration: 청크 길이 (초)
+            max_concurrency: 모든 세션을 통틀어 동시에 실행할 최대 전사 API 호출 수
+            max_ffmpeg_processes: 모든 세션을 통틀어 동시에 실행할 최대 FFmpeg 구간 추출 수
+            progress_interval: 진행 상황 전송 최소 간격 (초, 기본 10Hz)
+        """
+        self.model_manager = model_manager
+        self.max_concurrency = max_concurrency
+        self.progress_interval = progress_interval
+        
+        # I/O 단계(FFmpeg)와 API 단계(OpenAI)를 각각 별도로 제한
+        self.io_semaphore = asyncio.Semaphore(max_ffmpeg_processes)
+        self.api_semaphore = asyncio.Semaphore(max_concurrency)
+        
+        self.chunker = AudioChunker(chunk_duration, io_semaphore=self.io_semaphore)
+        self.active_sessions: Dict[str, StreamingSession] = {}
+    
+    async def _transcribe_chunk(
+        self,
+        chunk: StreamingChunk,
+        model: str,
+        language: str
+    ) -> Tuple[StreamingChunk, ChunkSegments]:
+        """청크 하나 전사 (시작/끝 시간 배열에 청크 오프셋을 더해서 반환)"""
+        
+        segments: List[Dict] = []
+        text, confidence = None, None
+        
+        async with self.api_semaphore:
+            # API 슬롯을 얻은 뒤에야 구간을 잘라 바이트를 만듦 (추출 실패는 전체 오류로 전파)
+            audio_data = await chunk.audio_source()
+            chunk_start_time = time.monotonic()
             
-            chunks.append(chunk)
-            print(f"  📦 청크 {chunk_id}: {start_time:.1f}s - {end_time:.1f}s")
+            try:
+                # 임시 파일 대신 메모리 버퍼로 바로 업로드 (name으로 포맷 판별)
+                audio_buffer = io.BytesIO(audio_data)
+                audio_buffer.name = f"chunk_{chunk.chunk_id}.{chunk.audio_format}"
+                
+                result = await self.model_manager.transcribe_with_model(
+                    audio_buffer, model, language, include_quality_metrics=True
+                )
+                
+                if result.success and result.text.strip():
+                    text = result.text.strip()
+                    confidence = result.confidence_score
+                    
+                    segments = result.segments
+                    
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("  ✅ 청크 %d: %s...", chunk.chunk_id + 1, text[:50])
+                
+                else:
+                    logger.warning("  ⚠️ 청크 %d: 전사 실패 또는 빈 결과", chunk.chunk_id + 1)
             
-            start_time = end_time - self.overlap
-            chunk_id += 1
+            except Exception as e:
+                logger.error("  ❌ 청크 %d 처리 오류: %s", chunk.chunk_id + 1, e)
             
-            if end_time >= total_duration:
-                break
+            # 처리 시간 기록
+            processing_time = time.monotonic() - chunk_start_time
+        
+        # 시간 오프셋 조정 (세그먼트 dict 복사 없이 배열 덧셈 한 번)
+        starts = np.fromiter((seg["start"] for seg in segments), dtype=np.float64, count=len(segments))
+        ends = np.fromiter((seg["end"] for seg in segments), dtype=np.float64, count=len(segments))
+        starts += chunk.start_time
+        ends += chunk.start_time
         
-        print(f"✅ 총 {len(chunks)}개 청크 생성 완료 (간단한 방식)")
-        return chunks
+        chunk = replace(chunk, text=text, confidence=confidence, processing_time=processing_time)
+        return chunk, (starts, ends, segments)
     
-    async def _chunk_with_pydub(self, audio_path: str) -> List[StreamingChunk]:
-        """pydub를 사용한 정확한 청킹"""
+    @staticmethod
+    def _merge_segments(
+        seg_starts: List[np.ndarray],
+        seg_ends: List[np.ndarray],
+        seg_items: List[Dict]
+    ) -> List[Dict]:
+        """청크별 세그먼트를 합쳐 시간순으로 정렬 (조정된 시간으로 dict는 마지막에 한 번만 생성)"""
         
-        # 오디오 로드
-        audio = AudioSegment.from_file(audio_path)
-        total_duration = len(audio) / 1000.0  # 초 단위
+        if not seg_items:
+            return []
         
-        chunks = []
-        chunk_id = 0
-        start_ms = 0
-        chunk_duration_ms = int(self.chunk_duration * 1000)
-        overlap_ms = int(self.overlap * 1000)
+        starts = np.concatenate(seg_starts)
+        ends = np.concatenate(seg_ends)
+        order = np.argsort(starts, kind="stable")
         
-        print(f"🎵 오디오 총 길이: {total_duration:.1f}초")
-        print(f"📊 청크 크기: {self.chunk_duration}초, 겹침: {self.overlap}초")
+        return [
+            {**seg_items[i], "start": start, "end": end}
+            for i, start, end in zip(order.tolist(), starts[order].tolist(), ends[order].tolist())
+        ]
+    
+    def _snapshot_progress(self, session: StreamingSession) -> StreamingProgress:
+        """세션 카운터로부터 진행 상황 생성 (마지막 전송 이후 끝난 청크 텍스트만 포함)"""
         
-        while start_ms < len(audio):
-            # 청크 끝 지점 계산
-            end_ms = min(start_ms + chunk_duration_ms, len(audio))
-            
-            # 오디오 청크 추출
-            chunk_audio = audio[start_ms:end_ms]
+        pending_texts = session.pending_texts
+        current_text = " ".join(pending_texts[cid] for cid in sorted(pending_texts))
+        pending_texts.clear()
+        
+        total_chunks = session.total_chunks
+        processed = session.processed_chunks
+        
+        return StreamingProgress(
+            total_chunks=total_chunks,
+            processed_chunks=processed,
+            current_chunk=session.current_chunk,
+            progress_percent=(processed / total_chunks) * 100 if total_chunks else 100.0,
+            current_text=current_text,
+            estimated_remaining_time=session.estimated_remaining_time,
+            status="processing"
+        )
+    
+    @staticmethod
+    def _publish(progress_queue: asyncio.Queue, progress: StreamingProgress):
+        """
+        최신 진행 상황만 남기는 큐에 넣기 (전송이 밀려도 전사를 멈추지 않음)
+        밀린 진행 상황은 버리되, 그 안의 청크 텍스트는 새 진행 상황 앞에 합쳐서 보존
+        """
+        try:
+            progress_queue.put_nowait(progress)
+        except asyncio.QueueFull:
+            stale = progress_queue.get_nowait()
+            if progress.status == "processing" and stale.current_text:
+                progress = replace(
+                    progress, current_text=f"{stale.current_text} {progress.current_text}".strip()
+                )
+            progress_queue.put_nowait(progress)
+    
+    async def _emit_progress(self, session: StreamingSession, progress_queue: asyncio.Queue):
+        """일정 간격으로 세션 카운터를 읽어 진행 상황 전송 (변경이 있을 때만)"""
+        
+        last_processed = 0
+        
+        while True:
+            await asyncio.sleep(self.progress_interval)
             
-            # 청크 데이터 생성
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                chunk_audio.export(temp_file.name, format="wav")
+            if session.processed_chunks != last_processed:
+                last_processed = session.processed_chunks
+                self._publish(progress_queue, self._snapshot_progress(session))
+    
+    async def _run_transcription(
+        self,
+        session_id: str,
+        session: StreamingSession,
+        audio_path: str,
+        bounds: List[Tuple[float, float]],
+        model: str,
+        language: str,
+        progress_queue: asyncio.Queue,
+        progress_callback: Optional[Callable]
+    ):
+        """청크 전사 실행 - 세션 카운터만 갱신하고 진행 상황 전송은 _emit_progress가 담당"""
+        
+        start_time = time.monotonic()
+        total_chunks = session.total_chunks
+        chunk_texts: Dict[int, str] = {}
+        # 세그먼트는 열 단위로 모아둠 (시작/끝 배열 + 원본 세그먼트)
+        seg_starts: List[np.ndarray] = []
+        seg_ends: List[np.ndarray] = []
+        seg_items: List[Dict] = []
+        total_processing_time = 0.0  # 청크 처리 시간 누적합 (평균 계산용)
+        max_concurrency = self.max_concurrency
+        
+        # 청크마다 전사 작업을 만들고, 끝나는 순서대로 결과 수집
+        results: asyncio.Queue = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
+        
+        async def _produce():
+            try:
+                async for chunk in self.chunker.chunk_audio_file(audio_path, bounds):
+                    task = asyncio.create_task(self._transcribe_chunk(chunk, model, language))
+                    task.add_done_callback(results.put_nowait)
+                    tasks.append(task)
+            except Exception as e:
+                results.put_nowait(e)
+        
+        producer = asyncio.create_task(_produce())
+        emitter = asyncio.create_task(self._emit_progress(session, progress_queue))
+        
+        try:
+            for i in range(total_chunks):
+                finished = await results.get()
+                if isinstance(finished, Exception):
+                    raise finished
+                
+                chunk, (starts, ends, segments) = finished.result()
+                processed = i + 1
+                total_processing_time += chunk.processing_time
                 
-                with open(temp_file.name, 'rb') as f:
-                    audio_data = f.read()
+                if chunk.text:
+                    chunk_texts[chunk.chunk_id] = chunk.text
+                    session.pending_texts[chunk.chunk_id] = chunk.text
+                    seg_starts.append(starts)
+                    seg_ends.append(ends)
+                    seg_items.extend(segments)
                 
-                os.unlink(temp_file.name)
+                # 남은 시간 추정 (동시 실행 수 고려)
+                avg_processing_time = total_processing_time / processed
+                remaining_chunks = total_chunks - processed
+                session.estimated_remaining_time = (
+                    avg_processing_time * math.ceil(remaining_chunks / max_concurrency)
+                )
+                session.current_chunk = chunk.chunk_id + 1
+                session.processed_chunks = processed
+                
+                # 프로그레스 콜백 호출
+                if progress_callback:
+                    await progress_callback(session_id, processed, total_chunks)
             
-            chunk = StreamingChunk(
-                chunk_id=chunk_id,
-                start_time=start_ms / 1000.0,
-                end_time=end_ms / 1000.0,
-                audio_data=audio_data
-            )
+            # 완료 후에는 중간 진행 상황을 더 보내지 않음
+            emitter.cancel()
             
-            chunks.append(chunk)
+            # 완료 순서가 뒤섞였으므로 시간순으로 재정렬
+            all_segments = self._merge_segments(seg_starts, seg_ends, seg_items)
+            full_text = " ".join(chunk_texts[cid] for cid in sorted(chunk_texts))
             
-            print(f"  📦 청크 {chunk_id}: {chunk.start_time:.1f}s - {chunk.end_time:.1f}s")
+            # 3단계: 완료
+            elapsed_time = time.monotonic() - start_time
+            session.status = "completed"
+            session.result = {
+                "text": full_text,
+                "segments": all_segments,
+                "total_processing_time": elapsed_time,
+                "chunks_processed": total_chunks
+            }
             
-            # 다음 청크 시작점 (겹침 고려)
-            start_ms = end_ms - overlap_ms
-            chunk_id += 1
+            self._publish(progress_queue, StreamingProgress(
+                total_chunks=total_chunks,
+                processed_chunks=total_chunks,
+                current_chunk=total_chunks,
+                progress_percent=100.0,
+                current_text=full_text,
+                estimated_remaining_time=0.0,
+                status="completed"
+            ))
             
-            # 마지막 청크인 경우 종료
-            if end_ms >= len(audio):
-                break
+            logger.info("🎉 스트리밍 전사 완료 - 총 %.2f초", elapsed_time)
         
-        print(f"✅ 총 {len(chunks)}개 청크 생성 완료")
-        return chunks
-
-
-class StreamingTranscriber:
-    """실시간 스트리밍 전사기"""
+        except asyncio.CancelledError:
+            # cancel_session()으로 취소된 경우 소비자에게 종료를 알림
+            if session.status == "cancelled":
+                self._publish(progress_queue, StreamingProgress(
+                    total_chunks=total_chunks,
+                    processed_chunks=session.processed_chunks,
+                    current_chunk=session.current_chunk,
+                    progress_percent=(session.processed_chunks / total_chunks) * 100 if total_chunks else 0.0,
+                    current_text="",
+                    estimated_remaining_time=0.0,
+                    status="cancelled"
+                ))
+            raise
+        
+        except Exception as e:
+            self._publish(progress_queue, self._error_progress(session, str(e)))
+        
+        finally:
+            emitter.cancel()
+            producer.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 수집되지 못한 실패 작업의 예외 확인 처리 (경고 방지)
     
-    def __init__(self, model_manager, chunk_duration: float = 30.0):
-        """초기화"""
-        self.model_manager = model_manager
-        self.chunker = AudioChunker(chunk_duration)
-        self.active_sessions: Dict[str, Dict] = {}
+    def _error_progress(self, session: StreamingSession, error_msg: str) -> StreamingProgress:
+        """오류 상태 기록 및 오류 진행 상황 생성"""
+        
+        logger.error("❌ 스트리밍 전사 오류: %s", error_msg)
+        
+        session.status = "error"
+        session.error = error_msg
+        
+        return StreamingProgress(
+            total_chunks=0,
+            processed_chunks=0,
+            current_chunk=0,
+            progress_percent=0.0,
+            current_text="",
+            estimated_remaining_time=0.0,
+            status="error",
+            error_message=error_msg
+        )
     
     async def transcribe_streaming(
         self,
@@ -195,16 +705,14 @@ class StreamingTranscriber:
     ) -> AsyncGenerator[StreamingProgress, None]:
         """스트리밍 전사 실행"""
         
-        start_time = time.time()
+        # 세션 초기화 (반복 조회를 피하기 위해 로컬 참조 유지)
+        session = self.active_sessions[session_id] = StreamingSession(
+            status="chunking",
+            start_time=time.time(),
+            model=model
+        )
         
         try:
-            # 세션 초기화
-            self.active_sessions[session_id] = {
-                "status": "chunking",
-                "start_time": start_time,
-                "model": model
-            }
-            
             # 1단계: 오디오 청킹
             yield StreamingProgress(
                 total_chunks=0,
@@ -216,144 +724,58 @@ class StreamingTranscriber:
                 status="chunking"
             )
             
-            chunks = await self.chunker.chunk_audio_file(audio_path)
-            total_chunks = len(chunks)
+            bounds = await self.chunker.plan_chunks(audio_path)
+            total_chunks = len(bounds)
             
             # 2단계: 병렬 전사 시작
-            self.active_sessions[session_id]["status"] = "processing"
-            full_text = ""
-            all_segments = []
-            processing_times = []
-            
-            for i, chunk in enumerate(chunks):
-                chunk_start_time = time.time()
-                
-                # 진행률 업데이트
-                progress_percent = (i / total_chunks) * 100
-                
-                # 남은 시간 추정
-                if processing_times:
-                    avg_processing_time = sum(processing_times) / len(processing_times)
-                    remaining_chunks = total_chunks - i
-                    estimated_remaining_time = avg_processing_time * remaining_chunks
-                else:
-                    estimated_remaining_time = 0.0
-                
-                yield StreamingProgress(
-                    total_chunks=total_chunks,
-                    processed_chunks=i,
-                    current_chunk=i + 1,
-                    progress_percent=progress_percent,
-                    current_text=f"청크 {i+1}/{total_chunks} 처리 중...",
-                    estimated_remaining_time=estimated_remaining_time,
-                    status="processing"
-                )
-                
-                # 청크 전사
-                try:
-                    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                        temp_file.write(chunk.audio_data)
-                        temp_file.flush()
-                        
-                        result = await self.model_manager.transcribe_with_model(
-                            temp_file.name, model, language, include_quality_metrics=True
-                        )
-                        
-                        os.unlink(temp_file.name)
-                    
-                    if result.success and result.text.strip():
-                        chunk.text = result.text.strip()
-                        chunk.confidence = result.confidence_score
-                        
-                        # 시간 오프셋 조정
-                        adjusted_segments = []
-                        for segment in result.segments:
-                            adj_segment = segment.copy()
-                            adj_segment["start"] += chunk.start_time
-                            adj_segment["end"] += chunk.start_time
-                            adjusted_segments.append(adj_segment)
-                        
-                        all_segments.extend(adjusted_segments)
-                        full_text += " " + chunk.text
-                        
-                        print(f"  ✅ 청크 {i+1}: {chunk.text[:50]}...")
-                    
-                    else:
-                        print(f"  ⚠️ 청크 {i+1}: 전사 실패 또는 빈 결과")
-                
-                except Exception as e:
-                    print(f"  ❌ 청크 {i+1} 처리 오류: {str(e)}")
-                
-                # 처리 시간 기록
-                chunk_processing_time = time.time() - chunk_start_time
-                processing_times.append(chunk_processing_time)
-                chunk.processing_time = chunk_processing_time
-                
-                # 중간 결과 업데이트
-                yield StreamingProgress(
-                    total_chunks=total_chunks,
-                    processed_chunks=i + 1,
-                    current_chunk=i + 1,
-                    progress_percent=((i + 1) / total_chunks) * 100,
-                    current_text=full_text.strip(),
-                    estimated_remaining_time=estimated_remaining_time,
-                    status="processing"
-                )
-                
-                # 프로그레스 콜백 호출
-                if progress_callback:
-                    await progress_callback(session_id, i + 1, total_chunks)
-            
-            # 3단계: 완료
-            total_processing_time = time.time() - start_time
-            self.active_sessions[session_id]["status"] = "completed"
-            self.active_sessions[session_id]["result"] = {
-                "text": full_text.strip(),
-                "segments": all_segments,
-                "total_processing_time": total_processing_time,
-                "chunks_processed": len(chunks)
-            }
+            session.status = "processing"
+            session.total_chunks = total_chunks
             
             yield StreamingProgress(
                 total_chunks=total_chunks,
-                processed_chunks=total_chunks,
-                current_chunk=total_chunks,
-                progress_percent=100.0,
-                current_text=full_text.strip(),
+                processed_chunks=0,
+                current_chunk=1 if total_chunks else 0,
+                progress_percent=0.0,
+                current_text=f"청크 {total_chunks}개 병렬 처리 중...",
                 estimated_remaining_time=0.0,
-                status="completed"
+                status="processing"
             )
             
-            print(f"🎉 스트리밍 전사 완료 - 총 {total_processing_time:.2f}초")
-            
-        except Exception as e:
-            error_msg = str(e)
-            print(f"❌ 스트리밍 전사 오류: {error_msg}")
+            # 전사는 백그라운드에서 진행하고, 진행 상황은 일정 간격으로 모아서 전달
+            # 소비자가 느리면 중간 진행 상황은 최신 것 하나로 합쳐짐 (_publish 참고)
+            progress_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+            worker = session.worker = asyncio.create_task(self._run_transcription(
+                session_id, session, audio_path, bounds, model, language,
+                progress_queue, progress_callback
+            ))
             
-            self.active_sessions[session_id]["status"] = "error"
-            self.active_sessions[session_id]["error"] = error_msg
+            try:
+                while True:
+                    progress = await progress_queue.get()
+                    yield progress
+                    
+                    if progress.status != "processing":
+                        break
+            finally:
+                worker.cancel()
             
-            yield StreamingProgress(
-                total_chunks=0,
-                processed_chunks=0,
-                current_chunk=0,
-                progress_percent=0.0,
-                current_text="",
-                estimated_remaining_time=0.0,
-                status="error",
-                error_message=error_msg
-            )
+        except Exception as e:
+            yield self._error_progress(session, str(e))
     
-    def get_session_status(self, session_id: str) -> Optional[Dict]:
+    def get_session_status(self, session_id: str) -> Optional[StreamingSession]:
         """세션 상태 조회"""
         return self.active_sessions.get(session_id)
     
     def cancel_session(self, session_id: str) -> bool:
-        """세션 취소"""
-        if session_id in self.active_sessions:
-            self.active_sessions[session_id]["status"] = "cancelled"
-            return True
-        return False
+        """세션 취소 (진행 중인 전사 작업도 중단)"""
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            return False
+        
+        session.status = "cancelled"
+        if session.worker and not session.worker.done():
+            session.worker.cancel()
+        return True
     
     def cleanup_session(self, session_id: str) -> bool:
         """세션 정리"""
@@ -379,7 +801,7 @@ class StreamingWebSocketHandler:
             pass
             
         except Exception as e:
-            print(f"❌ WebSocket 오류: {str(e)}")
+            logger.error(f"❌ WebSocket 오류: {str(e)}")
         
         finally:
             if session_id and session_id in self.connections:
@@ -430,4 +852,12 @@ async def test_streaming_system():
 
 
 if __name__ == "__main__":
+    # uvloop이 설치되어 있으면 더 빠른 이벤트 루프 사용 (Windows 미지원)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    
     asyncio.run(test_streaming_system())
@@ -4,16 +4,64 @@
 """
 
 import os
+import atexit
+import functools
 import json
+import logging
 import math
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import ClassVar, Dict, FrozenSet, List, Optional, Tuple
+from dataclasses import dataclass, replace
 
+# orjson이 있으면 템플릿 설정 파싱/저장에 사용 (UTF-8 바이트를 바로 처리)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# PyAV/mutagen이 있으면 FFprobe 프로세스 없이 컨테이너 헤더에서 바로 길이를 읽음
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+# 여러 프로세스가 같은 설정 파일을 저장할 때 쓰는 advisory lock (Windows에는 없음)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# FFmpeg/FFprobe 실행 파일 경로 (임포트 시 PATH에서 한 번만 찾음)
+_FFMPEG_PATH = shutil.which('ffmpeg')
+_FFPROBE_PATH = shutil.which('ffprobe')
+if not _FFMPEG_PATH or not _FFPROBE_PATH:
+    # 임포트는 막지 않음 (PyAV가 있으면 길이 감지는 가능) - 시작할 때 한 번만 알림
+    print("⚠️ PATH에서 ffmpeg/ffprobe를 찾을 수 없음 - 템플릿 비디오 렌더링이 실패합니다")
+FFMPEG = _FFMPEG_PATH or 'ffmpeg'
+FFPROBE = _FFPROBE_PATH or 'ffprobe'
+
+
+@dataclass(frozen=True, slots=True)
 class TemplateInfo:
     """템플릿 정보 데이터 클래스"""
     name: str
@@ -24,33 +72,88 @@ class TemplateInfo:
     video_file: str
     preview_image: str
     created_at: str
-    recommended_for: List[str]
+    recommended_for: Tuple[str, ...]  # frozen 인스턴스에 맞게 불변 튜플로 보관
     # 🆕 Phase 3.2.3: 트랜지션 설정
     recommended_transition: str = "crossfade"  # 기본 트랜지션
     optimal_transition_duration: float = 1.0  # 최적 트랜지션 길이 (초)
+    path: str = ""  # 템플릿 비디오 전체 경로 (resolve()로 얻은 경우에만 채워짐)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TransitionConfig:
     """트랜지션 설정 데이터 클래스"""
+    VALID_TYPES: ClassVar[FrozenSet[str]] = frozenset(("crossfade", "fade", "dissolve", "wipe", "none"))
+    
     type: str = "crossfade"  # crossfade, fade, dissolve, wipe, none
     duration: float = 1.0    # 트랜지션 길이 (초)
     intensity: float = 0.8   # 트랜지션 강도 (0.0 ~ 1.0)
     
     def __post_init__(self):
-        # 유효성 검사
-        valid_types = ["crossfade", "fade", "dissolve", "wipe", "none"]
-        if self.type not in valid_types:
-            self.type = "crossfade"
+        # 유효성 검사 (frozen이므로 object.__setattr__로 보정값 설정)
+        if self.type not in self.VALID_TYPES:
+            object.__setattr__(self, "type", "crossfade")
         
-        self.duration = max(0.1, min(5.0, self.duration))  # 0.1~5초 제한
-        self.intensity = max(0.0, min(1.0, self.intensity))  # 0~1 제한
+        object.__setattr__(self, "duration", max(0.1, min(5.0, self.duration)))  # 0.1~5초 제한
+        object.__setattr__(self, "intensity", max(0.0, min(1.0, self.intensity)))  # 0~1 제한
+
+
+# 루프 계획: (필요한 총 루프 수, FFmpeg 추가 루프 수, 페이드 길이)
+LoopPlan = Tuple[int, int, float]
+
+
+def _ceil_loops(audio_duration: float, template_duration: float) -> int:
+    """
+    필요한 총 루프 횟수 (밀리초 정수 올림 나눗셈)
+    음성 길이는 올림(1ms 미만으로 넘쳐도 루프 하나 추가), 템플릿 길이는 내림(루프가 모자라지 않도록)
+    밀리초 변환 시 부동소수점 오차(예: 300.00000000000006)는 반올림으로 제거
+    """
+    template_ms = int(round(template_duration * 1000, 6))
+    if template_ms <= 0:
+        raise ValueError(f"잘못된 템플릿 길이: {template_duration}")
+    audio_ms = math.ceil(round(audio_duration * 1000, 6))
+    return (audio_ms + template_ms - 1) // template_ms
+
+
+def _plan_loops(audio_duration: float, template_duration: float, transition_duration: float = 0.0) -> LoopPlan:
+    """렌더링 한 번에 필요한 루프 정보를 한 번만 계산"""
+    loops_needed = _ceil_loops(audio_duration, template_duration)
+    fade_duration = min(transition_duration / 2, template_duration / 8)  # 템플릿 길이의 1/8 이하
+    return loops_needed, max(0, loops_needed - 1), fade_duration
+
+
+# 감지한 템플릿 길이 캐시 (템플릿 경로 → 길이/파일 stat)
+# 수정 시각/크기는 체크아웃마다 달라지므로 저장소에 커밋되는 template_config.json이 아닌 무시되는 .cache에 저장
+DURATION_CACHE_FILE = Path(__file__).parent / ".cache" / "template_durations.json"
+
+
+def _read_json(path: Path) -> Dict:
+    """JSON 파일을 바이트로 한 번에 읽어 파싱 (orjson이 있으면 사용)"""
+    raw = path.read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+# 종료 시 설정을 저장할 템플릿 매니저들 (약한 참조 - 인스턴스 수명을 늘리지 않음)
+_live_managers: "weakref.WeakSet[TemplateManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_managers():
+    """살아 있는 모든 템플릿 매니저의 변경 사항 저장 (atexit 콜백은 모듈에 한 번만 등록)"""
+    for manager in list(_live_managers):
+        manager.flush()
 
 
 class TemplateManager:
     """템플릿 비디오 관리 클래스"""
     
-    def __init__(self, templates_dir: str = None):
+    VALIDATE_TTL: ClassVar[float] = 5.0  # validate_template 결과 캐시 유지 시간(초)
+    
+    def __init__(self, templates_dir: str = None, preload_durations: bool = False):
+        """
+        Args:
+            templates_dir: 템플릿 디렉토리 (기본: 이 파일 옆의 templates)
+            preload_durations: 길이 정보가 없는 템플릿을 초기화 시 병렬로 미리 감지
+        """
         if templates_dir is None:
             # 현재 파일 기준으로 templates 디렉토리 경로 설정
             current_dir = Path(__file__).parent
@@ -58,96 +161,221 @@ class TemplateManager:
         else:
             self.templates_dir = Path(templates_dir)
         
-        self.config_file = self.templates_dir / "template_config.json"
+        self.config_file = self.templates_dir / "template_config.json"  # 읽기 전용
         self.templates_data = self._load_templates_config()
+        
+        # (경로, 수정 시각, 크기) → 감지된 템플릿 길이 (파일이 바뀌지 않았으면 FFprobe를 다시 실행하지 않음)
+        self._duration_cache: Dict[Tuple[str, int, int], float] = {}
+        # 이전 실행에서 감지해 DURATION_CACHE_FILE에 저장한 길이 (템플릿 경로 → {"duration", "stat"})
+        self.duration_cache_file = DURATION_CACHE_FILE
+        self._stored_durations: Dict[str, Dict] = self._load_duration_cache()
+        self._pending: Dict[str, Dict] = {}  # 이 프로세스가 새로 감지해 아직 저장하지 않은 항목
+        self._lock = threading.Lock()  # 캐시 수정/저장 보호 (렌더링 스레드와 atexit 저장이 겹칠 수 있음)
+        
+        # 템플릿 이름 → 비디오 파일 경로 (설정에서 한 번만 계산)
+        self._path_cache: Dict[str, str] = {
+            name: str(self.templates_dir / info["video_file"])
+            for name, info in self.templates_data.get("templates", {}).items()
+            if info.get("video_file")
+        }
+        # 템플릿 이름 → (검증 시각, 결과): 연속 렌더링 시 반복 stat 호출 방지
+        self._validate_cache: Dict[str, Tuple[float, bool]] = {}
+        _live_managers.add(self)  # 종료 시 변경 사항 저장 (_flush_live_managers)
+        
+        if preload_durations:
+            self._prefetch_durations()
     
     def _load_templates_config(self) -> Dict:
-        """템플릿 설정 파일 로드"""
+        """템플릿 설정 파일 로드 (파일을 한 번만 열어서 바이트로 읽고 파싱)"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                print(f"⚠️ 템플릿 설정 파일을 찾을 수 없음: {self.config_file}")
-                return {"templates": {}, "config": {}}
+            return _read_json(self.config_file)
+        except FileNotFoundError:
+            print(f"⚠️ 템플릿 설정 파일을 찾을 수 없음: {self.config_file}")
+            return {"templates": {}, "config": {}}
         except Exception as e:
             print(f"❌ 템플릿 설정 로드 실패: {str(e)}")
             return {"templates": {}, "config": {}}
     
+    def _load_duration_cache(self) -> Dict[str, Dict]:
+        """감지한 템플릿 길이 캐시 파일 로드 (없거나 깨졌으면 빈 캐시)"""
+        try:
+            return _read_json(self.duration_cache_file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ 템플릿 길이 캐시 로드 실패: {str(e)}")
+            return {}
+    
     def get_template_duration(self, template_name: str) -> float:
-        """FFprobe로 템플릿 비디오 길이 자동 감지"""
+        """
+        템플릿 비디오 길이 반환
+        메모리 캐시 → 길이 캐시 파일 (stat이 현재 파일과 같을 때) → 설정 파일의 duration → FFprobe 순으로 확인
+        """
+        template_data = self.templates_data.get("templates", {}).get(template_name, {})
+        
         try:
             template_path = self.get_template_path(template_name)
-            if not template_path or not os.path.exists(template_path):
+            try:
+                st = os.stat(template_path) if template_path else None
+            except OSError:
+                st = None
+            if st is None:
                 print(f"❌ 템플릿 파일을 찾을 수 없음: {template_name}")
-                return 25.0  # 기본값
+                return float(template_data.get("duration") or 25.0)  # 설정값 또는 기본값
             
-            # FFprobe로 비디오 길이 감지
-            cmd = [
-                'ffprobe', 
-                '-v', 'quiet', 
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(template_path)
-            ]
+            key = (template_path, st.st_mtime_ns, st.st_size)
+            cached = self._duration_cache.get(key)
+            if cached:
+                return cached
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
-                duration = float(result.stdout.strip())
+            file_stat = [st.st_mtime_ns, st.st_size]
+            duration = self._stored_duration(template_name, template_path, file_stat)
+            if duration is None:
+                duration = self._probe_duration(template_path)
+                if duration is None:
+                    return 25.0  # 기본값
                 print(f"🎬 템플릿 '{template_name}' 길이 감지: {duration:.2f}초")
-                
-                # 설정 파일의 duration 필드 업데이트
-                self._update_template_duration(template_name, duration)
-                
-                return duration
-            else:
-                print(f"⚠️ FFprobe 실행 실패: {result.stderr}")
-                return 25.0  # 기본값
+                # 감지한 길이는 캐시 파일에 기록 (저장은 flush에서 한 번에)
+                self._remember_duration(template_name, template_path, duration, file_stat)
+            
+            self._duration_cache[key] = duration
+            
+            return duration
                 
         except Exception as e:
             print(f"❌ 템플릿 길이 감지 오류: {str(e)}")
             return 25.0  # 기본값
     
-    def _update_template_duration(self, template_name: str, duration: float):
-        """템플릿 설정의 duration 필드 업데이트"""
+    def _stored_duration(self, template_name: str, template_path: str, file_stat: List[int]) -> Optional[float]:
+        """
+        저장된 템플릿 길이 (없으면 None)
+        캐시 파일의 값은 저장 당시 파일과 현재 파일이 같을 때만 사용하고,
+        설정 파일의 duration은 직접 입력한 값으로 보고 그대로 사용
+        """
+        entry = self._stored_durations.get(template_path)
+        if entry and list(entry.get("stat", ())) == file_stat:
+            return float(entry["duration"])
+        
+        duration = self.templates_data.get("templates", {}).get(template_name, {}).get("duration")
+        return float(duration) if duration else None
+    
+    @staticmethod
+    def _probe_duration(template_path: str) -> Optional[float]:
+        """비디오 길이 감지 (실패 시 None)"""
         try:
-            if template_name in self.templates_data.get("templates", {}):
-                self.templates_data["templates"][template_name]["duration"] = duration
-                # 설정 파일에 저장
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.templates_data, f, ensure_ascii=False, indent=2)
-                print(f"✅ 템플릿 '{template_name}' 길이 정보 업데이트: {duration:.2f}초")
+            return _probe_media_duration(str(template_path))
         except Exception as e:
-            print(f"⚠️ 템플릿 길이 정보 저장 실패: {str(e)}")
+            print(f"❌ 템플릿 길이 감지 오류: {str(e)}")
+        return None
+    
+    def _prefetch_durations(self):
+        """길이 정보가 없는 템플릿들을 병렬로 감지하고 길이 캐시 파일은 한 번만 저장"""
+        missing = {}
+        for name in self.get_available_templates():
+            template_path = self.get_template_path(name)
+            try:
+                st = os.stat(template_path) if template_path else None
+            except OSError:
+                continue
+            if st is None:
+                continue
+            
+            file_stat = [st.st_mtime_ns, st.st_size]
+            if self._stored_duration(name, template_path, file_stat) is None:
+                missing[name] = (template_path, file_stat)
+        
+        if not missing:
+            return
+        
+        print(f"🎬 템플릿 {len(missing)}개 길이 병렬 감지 중...")
+        
+        # 서브프로세스 대기 중에는 GIL이 풀리므로 스레드로 충분
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+            durations = executor.map(self._probe_duration, (path for path, _ in missing.values()))
+            for (name, (template_path, file_stat)), duration in zip(missing.items(), durations):
+                if duration is not None:
+                    self._remember_duration(name, template_path, duration, file_stat)
+                    self._duration_cache[(template_path, *file_stat)] = duration
+        
+        self.flush()
+    
+    def _remember_duration(self, template_name: str, template_path: str, duration: float, file_stat: List[int]):
+        """
+        감지한 템플릿 길이를 길이 캐시에 기록 (파일 저장은 flush에서 한 번에)
+        저장된 값과 같으면 아무것도 하지 않음
+        """
+        entry = {"duration": duration, "stat": file_stat}
+        if self._stored_durations.get(template_path) == entry:
+            return
+        
+        with self._lock:
+            self._stored_durations[template_path] = entry
+            self._pending[template_path] = entry
+        print(f"✅ 템플릿 '{template_name}' 길이 정보 업데이트: {duration:.2f}초")
+    
+    def flush(self):
+        """
+        변경된 템플릿 길이 캐시를 파일에 저장 (종료 시 자동 호출)
+        같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체 (중간에 끊겨도 캐시 파일이 깨지지 않음)
+        여러 프로세스가 동시에 저장해도 서로의 항목을 덮어쓰지 않도록 .lock 파일에 advisory lock을 잡은 상태에서
+        캐시 파일을 다시 읽고 이 프로세스가 새로 감지한 항목만 합쳐서 저장
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            
+            cache_file = self.duration_cache_file
+            tmp_path = None
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file.with_suffix('.json.lock'), 'wb') as lock_file:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    
+                    # lock을 잡은 뒤 다시 읽어야 그사이 다른 프로세스가 저장한 항목이 반영됨
+                    merged = self._load_duration_cache()
+                    merged.update(self._pending)
+                    
+                    with tempfile.NamedTemporaryFile(
+                        mode='wb', dir=cache_file.parent, suffix='.json.tmp', delete=False
+                    ) as tmp_file:
+                        tmp_path = tmp_file.name
+                        if ORJSON_AVAILABLE:
+                            tmp_file.write(orjson.dumps(merged, option=orjson.OPT_INDENT_2))
+                        else:
+                            tmp_file.write(json.dumps(merged, ensure_ascii=False, indent=2).encode('utf-8'))
+                    
+                    os.replace(tmp_path, cache_file)  # lock은 파일을 닫을 때 해제
+                self._stored_durations = merged
+                self._pending.clear()
+            except Exception as e:
+                print(f"⚠️ 템플릿 길이 정보 저장 실패: {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
     
     def calculate_dynamic_loops(self, audio_duration: float, template_duration: float) -> int:
-        """음성 길이에 맞는 템플릿 루프 횟수 동적 계산"""
-        if template_duration <= 0:
+        """음성 길이에 맞는 템플릿 루프 횟수 동적 계산 (FFmpeg -stream_loop용 추가 루프 횟수)"""
+        if template_duration * 1000 < 1:
             print(f"⚠️ 잘못된 템플릿 길이: {template_duration}")
             return 0
         
-        # 필요한 총 루프 횟수 계산 (올림)
-        total_loops_needed = math.ceil(audio_duration / template_duration)
-        
-        # FFmpeg의 -stream_loop는 추가 루프 횟수 (원본 1회 + 추가 루프)
+        # 필요한 총 루프 횟수 (올림), 추가 루프 횟수 (원본 1회 + 추가 루프)
+        total_loops_needed = _ceil_loops(audio_duration, template_duration)
         additional_loops = max(0, total_loops_needed - 1)
         
-        print(f"🔄 루프 계산:")
-        print(f"   음성 길이: {audio_duration:.2f}초")
-        print(f"   템플릿 길이: {template_duration:.2f}초")  
-        print(f"   필요한 총 루프: {total_loops_needed}회")
-        print(f"   FFmpeg 추가 루프: {additional_loops}회")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔄 루프 계산: 음성 %.2f초 / 템플릿 %.2f초 → 총 %d회 (FFmpeg 추가 루프 %d회)",
+                audio_duration, template_duration, total_loops_needed, additional_loops
+            )
         
         return additional_loops
     
     def get_template_path(self, template_name: str) -> Optional[str]:
         """템플릿 비디오 파일 경로 반환"""
-        template_info = self.templates_data.get("templates", {}).get(template_name)
-        if template_info:
-            video_file = template_info.get("video_file")
-            if video_file:
-                template_path = self.templates_dir / video_file
-                return str(template_path)
+        template_path = self._path_cache.get(template_name)
+        if template_path:
+            return template_path
         
         print(f"⚠️ 템플릿 '{template_name}' 정보를 찾을 수 없음")
         return None
@@ -169,21 +397,39 @@ class TemplateManager:
                 video_file=template_data.get("video_file", ""),
                 preview_image=template_data.get("preview_image", ""),
                 created_at=template_data.get("created_at", ""),
-                recommended_for=template_data.get("recommended_for", []),
+                recommended_for=tuple(template_data.get("recommended_for", ())),
                 # 🆕 Phase 3.2.3: 트랜지션 설정
                 recommended_transition=template_data.get("recommended_transition", "crossfade"),
                 optimal_transition_duration=template_data.get("optimal_transition_duration", 1.0)
             )
         return None
     
+    def resolve(self, template_name: str) -> Optional[TemplateInfo]:
+        """렌더링에 필요한 템플릿 정보를 한 번에 반환 (길이와 경로 포함, FFprobe는 길이가 없을 때만)"""
+        template_data = self.templates_data.get("templates", {}).get(template_name)
+        if not template_data:
+            return None
+        
+        info = self.get_template_info(template_name)
+        return replace(
+            info,
+            duration=self.get_template_duration(template_name),
+            path=self._path_cache.get(template_name, "")
+        )
+    
     def validate_template(self, template_name: str) -> bool:
-        """템플릿 파일 존재 여부 검증"""
-        template_path = self.get_template_path(template_name)
-        if template_path and os.path.exists(template_path):
-            return True
+        """템플릿 파일 존재 여부 검증 (VALIDATE_TTL초 동안 결과 재사용)"""
+        now = time.monotonic()
+        cached = self._validate_cache.get(template_name)
+        if cached and now - cached[0] < self.VALIDATE_TTL:
+            return cached[1]
         
-        print(f"❌ 템플릿 파일이 존재하지 않음: {template_path}")
-        return False
+        template_path = self.get_template_path(template_name)
+        ok = bool(template_path) and os.path.isfile(template_path)
+        self._validate_cache[template_name] = (now, ok)
+        if not ok:
+            print(f"❌ 템플릿 파일이 존재하지 않음: {template_path}")
+        return ok
 
 
 def create_seamless_looped_video(
@@ -191,32 +437,33 @@ def create_seamless_looped_video(
     audio_duration: float,
     template_duration: float,
     transition_config: TransitionConfig,
-    output_temp_path: str
+    output_temp_path: str,
+    plan: Optional[LoopPlan] = None
 ) -> bool:
     """🆕 Phase 3.2.3: 트랜지션 효과가 있는 심리스 루프 비디오 생성"""
     
     try:
         print(f"🌟 트랜지션 효과 적용: {transition_config.type} ({transition_config.duration}초)")
         
+        # 루프 계획은 한 번만 계산해서 하위 함수로 전달
+        plan = plan or _plan_loops(audio_duration, template_duration, transition_config.duration)
+        
         if transition_config.type == "none":
             # 트랜지션 없음 - 기존 방식
-            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
-        
-        # 필요한 총 루프 횟수 계산
-        total_loops_needed = math.ceil(audio_duration / template_duration)
+            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
         
-        if total_loops_needed <= 1:
+        if plan[0] <= 1:
             # 루프가 필요없는 경우 - 기본 방식
-            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
+            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
         
         # 트랜지션 타입별 처리
         if transition_config.type == "crossfade":
-            return create_crossfade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path)
+            return create_crossfade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path, plan)
         elif transition_config.type == "fade":
-            return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path)
+            return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path, plan)
         else:
             # 기본값: fade 사용 (가장 안정적)
-            return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path)
+            return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path, plan)
             
     except Exception as e:
         print(f"❌ 트랜지션 비디오 생성 실패: {str(e)}")
@@ -228,76 +475,65 @@ def create_fade_loop(
     audio_duration: float, 
     template_duration: float,
     transition_config: TransitionConfig,
-    output_temp_path: str
+    output_temp_path: str,
+    plan: Optional[LoopPlan] = None
 ) -> bool:
     """Fade 트랜지션으로 루프 비디오 생성 (안정적)"""
     
     try:
-        # 필요한 총 루프 횟수 계산 (오디오 길이에 맞게)
-        loops_needed = math.ceil(audio_duration / template_duration)
-        fade_duration = min(transition_config.duration / 2, template_duration / 8)  # 템플릿 길이의 1/8 이하
+        # 필요한 총 루프 횟수 / 페이드 길이 (오디오 길이에 맞게)
+        plan = plan or _plan_loops(audio_duration, template_duration, transition_config.duration)
+        loops_needed, _, fade_duration = plan
         
         print(f"🌙 Fade 트랜지션 루프 생성:")
         print(f"   필요한 루프: {loops_needed}회")
         print(f"   페이드 길이: {fade_duration:.2f}초")
         
-        # 임시 파일을 사용하여 페이드 인/아웃이 적용된 단일 루프 생성
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_single_loop:
-            single_loop_path = temp_single_loop.name
-        
-        # 1. 먼저 페이드 인/아웃이 적용된 단일 루프 생성
-        filter_complex = f"fade=t=out:st={template_duration - fade_duration}:d={fade_duration},fade=t=in:st=0:d={fade_duration}"
-        
-        single_loop_cmd = [
-            'ffmpeg',
-            '-i', template_path,
-            '-vf', filter_complex,
-            '-c:v', 'libx264',
-            '-preset', 'medium', 
-            '-crf', '23',
-            '-an',  # 오디오 제거
-            '-y',
-            single_loop_path
-        ]
-        
-        result = subprocess.run(single_loop_cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"⚠️ 단일 루프 생성 실패: {result.stderr}")
-            if os.path.exists(single_loop_path):
-                os.unlink(single_loop_path)
-            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
-        
-        # 2. 생성된 단일 루프를 여러 번 반복하여 최종 비디오 생성
-        final_cmd = [
-            'ffmpeg',
-            '-stream_loop', str(loops_needed - 1),  # 첫 번째 루프는 이미 포함되어 있으므로 -1
-            '-i', single_loop_path,
-            '-t', str(audio_duration),  # 오디오 길이로 자름
-            '-c:v', 'libx264',
-            '-preset', 'medium', 
-            '-crf', '23',
-            '-an',  # 오디오 제거 (최종 비디오에서는 원본 오디오 사용)
-            '-y',
-            output_temp_path
-        ]
-        
-        result = subprocess.run(final_cmd, capture_output=True, text=True)
-        
-        # 임시 파일 삭제
-        if os.path.exists(single_loop_path):
-            os.unlink(single_loop_path)
+        # 페이드는 템플릿 한 주기에만 적용하고 그 클립을 반복 (필터 수가 루프 횟수와 무관)
+        with _ffmpeg_tempfile('.mp4') as single_loop_path:
+            # 1. 먼저 페이드 인/아웃이 적용된 단일 루프 생성
+            filter_complex = f"fade=t=out:st={template_duration - fade_duration}:d={fade_duration},fade=t=in:st=0:d={fade_duration}"
+            
+            single_loop_cmd = [
+                FFMPEG,
+                '-i', template_path,
+                '-vf', filter_complex,
+                *_video_codec_args(),
+                '-an',  # 오디오 제거
+                '-y',
+                single_loop_path
+            ]
+            
+            result = _run_ffmpeg(single_loop_cmd)
+            
+            if result.returncode != 0:
+                print(f"⚠️ 단일 루프 생성 실패: {result.stderr}")
+                return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
+            
+            # 2. 생성된 단일 루프를 입력 단계에서 반복 (이미 인코딩된 클립이므로 스트림 복사)
+            final_cmd = [
+                FFMPEG,
+                '-stream_loop', str(loops_needed - 1),  # 첫 번째 루프는 이미 포함되어 있으므로 -1
+                '-i', single_loop_path,
+                '-t', str(audio_duration),  # 오디오 길이로 자름
+                '-c:v', 'copy',
+                '-an',  # 오디오 제거 (최종 비디오에서는 원본 오디오 사용)
+                '-y',
+                output_temp_path
+            ]
+            
+            result = _run_ffmpeg(final_cmd)
         
         if result.returncode != 0:
             print(f"⚠️ Fade 루프 생성 실패: {result.stderr}")
-            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
+            return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
         
         print(f"✅ Fade 루프 비디오 생성 완료")
         return True
         
     except Exception as e:
         print(f"❌ Fade 생성 오류: {str(e)}")
-        return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
+        return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
 
 
 def create_crossfade_loop(
@@ -305,75 +541,331 @@ def create_crossfade_loop(
     audio_duration: float, 
     template_duration: float,
     transition_config: TransitionConfig,
-    output_temp_path: str
+    output_temp_path: str,
+    plan: Optional[LoopPlan] = None
 ) -> bool:
-    """Crossfade 트랜지션으로 루프 비디오 생성 (고급)"""
+    """Crossfade 트랜지션으로 루프 비디오 생성 (고급) - 실패 시 fade로 대체"""
     
     try:
-        # Crossfade는 복잡하므로 일단 fade로 대체 (안정성 우선)
-        print(f"🔄 Crossfade 요청 → Fade로 대체 (안정성 우선)")
-        return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path)
+        # 크로스페이드가 들어간 한 주기를 한 번만 렌더링하고 그 클립을 반복 (입력/필터 수가 루프 횟수와 무관)
+        filter_graph, cycle_duration = _crossfade_cycle_graph(template_duration, transition_config.duration)
+        cycles_needed = _ceil_loops(audio_duration, cycle_duration)
+        
+        print(f"🔄 Crossfade 트랜지션 루프 생성: {cycle_duration:.2f}초 주기 {cycles_needed}회 반복")
+        
+        with _ffmpeg_tempfile('.mp4') as cycle_path:
+            # 1. 템플릿 끝부분에 처음 부분을 겹쳐 섞은 한 주기 생성 (같은 템플릿을 입력 두 개로 디코딩)
+            cycle_cmd = [
+                FFMPEG,
+                '-i', template_path,
+                '-i', template_path,
+                '-filter_complex', filter_graph,
+                '-map', '[cycle]',
+                *_video_codec_args(),
+                '-an',
+                '-y',
+                cycle_path
+            ]
+            
+            result = _run_ffmpeg(cycle_cmd)
+            if result.returncode == 0:
+                # 2. 주기 클립을 입력 단계에서 반복 (이미 인코딩된 클립이므로 스트림 복사)
+                loop_cmd = [
+                    FFMPEG,
+                    '-stream_loop', str(cycles_needed - 1),
+                    '-i', cycle_path,
+                    '-t', str(audio_duration),  # 오디오 길이로 자름
+                    '-c:v', 'copy',
+                    '-an',
+                    '-y',
+                    output_temp_path
+                ]
+                result = _run_ffmpeg(loop_cmd)
+        
+        if result.returncode == 0:
+            print(f"✅ Crossfade 루프 비디오 생성 완료")
+            return True
+        
+        print(f"⚠️ Crossfade 루프 생성 실패, Fade로 대체: {result.stderr}")
+        return create_fade_loop(template_path, audio_duration, template_duration, transition_config, output_temp_path, plan)
         
     except Exception as e:
         print(f"❌ Crossfade 생성 오류: {str(e)}")
-        return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path)
+        return create_basic_looped_video(template_path, audio_duration, template_duration, output_temp_path, plan)
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_video_stream_cached(video_path: str, mtime_ns: int) -> Tuple[str, str, int]:
+    """
+    첫 번째 비디오 스트림의 (코덱 이름, "가로x세로", 프레임 수) 감지 (경로 + 수정 시각 기준으로 캐시)
+    PyAV가 있으면 프로세스 내에서, 없으면 FFprobe 한 번으로 함께 읽음 (프레임 수를 모르면 0)
+    """
+    if AV_AVAILABLE:
+        try:
+            with av.open(video_path) as container:
+                stream = container.streams.video[0]
+                codec_context = stream.codec_context
+                return codec_context.name, f"{codec_context.width}x{codec_context.height}", stream.frames
+        except Exception:
+            pass
+    
+    cmd = [
+        FFPROBE,
+        '-v', 'quiet',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,width,height,nb_frames',
+        '-of', 'csv=p=0',
+        video_path
+    ]
+    
+    fields = _run_ffprobe(cmd).decode('ascii', errors='replace').strip().split(',')
+    if len(fields) < 3:
+        raise RuntimeError(f"비디오 스트림 정보 감지 실패: {video_path}")
+    codec_name, width, height = fields[:3]
+    frames = int(fields[3]) if len(fields) > 3 and fields[3].isdigit() else 0
+    return codec_name, f"{width}x{height}", frames
+
+
+def _probe_video_stream(video_path: str) -> Optional[Tuple[str, str, int]]:
+    """비디오 스트림 (코덱 이름, 해상도, 프레임 수) 반환 (실패는 캐시하지 않고 None)"""
+    try:
+        return _probe_video_stream_cached(video_path, os.stat(video_path).st_mtime_ns)
+    except Exception as e:
+        print(f"⚠️ 비디오 스트림 정보 감지 실패: {str(e)}")
+    return None
+
+
+def _probe_video_codec(video_path: str) -> Optional[str]:
+    """첫 번째 비디오 스트림 코덱 이름 감지 (실패 시 None)"""
+    stream = _probe_video_stream(video_path)
+    return stream[0] if stream else None
+
+
+def _crossfade_cycle_graph(template_duration: float, transition_duration: float) -> Tuple[str, float]:
+    """
+    이어 붙여 반복하면 경계가 크로스페이드되는 한 주기 필터 그래프와 주기 길이
+    템플릿의 X초~끝 구간에, 마지막 X초 동안 템플릿 처음 X초를 섞음
+    → 주기 끝이 템플릿 X초 지점으로 이어지므로 다음 주기(X초부터 시작)와 자연스럽게 연결
+    입력 0/1은 같은 템플릿, 출력 라벨은 [cycle]
+    """
+    xfade_duration = min(transition_duration, template_duration / 4)
+    cycle_duration = template_duration - xfade_duration
+    graph = (
+        f"[0:v]trim=start={xfade_duration},setpts=PTS-STARTPTS[body];"
+        f"[1:v]trim=end={xfade_duration},setpts=PTS-STARTPTS[head];"
+        f"[body][head]xfade=transition=fade:duration={xfade_duration}"
+        f":offset={round(template_duration - 2 * xfade_duration, 3)}[cycle]"
+    )
+    return graph, cycle_duration
+
+
+def _stream_loop_args(template_path: str, additional_loops: int) -> List[str]:
+    """템플릿을 입력 단계에서 additional_loops번 더 반복하는 FFmpeg 입력 인자"""
+    return ['-stream_loop', str(additional_loops), '-i', template_path]
+
+
+def _probe_resolution(video_path: str) -> Optional[str]:
+    """첫 번째 비디오 스트림 해상도 감지 (예: "1920x1080", 실패 시 None)"""
+    stream = _probe_video_stream(video_path)
+    return stream[1] if stream else None
+
+
+# 템플릿 한 주기를 디코딩한 프레임으로 메모리에 들고 반복할 수 있는 최대 크기 (yuv420p 기준)
+LOOP_BUFFER_BYTES = 256 * 1024 * 1024
 
 
-def create_basic_looped_video(template_path: str, audio_duration: float, template_duration: float, output_temp_path: str) -> bool:
+def _buffered_loop_filter(template_path: str, additional_loops: int) -> Optional[str]:
+    """
+    디코딩한 템플릿 한 주기를 메모리에서 반복하는 loop 필터 (템플릿을 한 번만 디코딩)
+    -stream_loop은 반복할 때마다 다시 디코딩하므로, 한 주기가 LOOP_BUFFER_BYTES 안에 들어갈 때만 사용
+    (1080p 템플릿 몇십 초는 수 GB라 해당되지 않음 - 그때는 None)
+    """
+    stream = _probe_video_stream(template_path)
+    if not stream or additional_loops <= 0:
+        return None
+    
+    _, resolution, frames = stream
+    width, height = (int(v) for v in resolution.split('x'))
+    if not 0 < frames <= 32767 or frames * width * height * 3 // 2 > LOOP_BUFFER_BYTES:
+        return None
+    return f"loop=loop={additional_loops}:size={frames}:start=0"
+
+
+# 작은 임시 파일(ASS 자막 등)을 디스크 대신 둘 메모리 기반 디렉토리 (Linux tmpfs, 없으면 None)
+MEMORY_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+@contextmanager
+def _ffmpeg_tempfile(suffix: str, content: Optional[bytes] = None, in_memory: bool = False):
+    """
+    FFmpeg 중간 파일용 임시 경로 (블록을 벗어나면 예외가 나도 삭제)
+    content가 있으면 생성할 때 바로 기록, in_memory면 가능한 경우 tmpfs에 생성
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=MEMORY_TEMP_DIR if in_memory else None)
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            if content is not None:
+                temp_file.write(content)
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+# 사용 가능한지 확인해볼 하드웨어 H.264 인코더 (우선순위 순)
+HW_ENCODER_CANDIDATES = (
+    ("h264_videotoolbox", ('-b:v', '8M')),                       # macOS
+    ("h264_nvenc", ('-preset', 'p4', '-rc', 'vbr', '-cq', '23')),  # NVIDIA
+    ("h264_qsv", ('-global_quality', '23')),                     # Intel Quick Sync
+)
+
+# 템플릿은 같은 영상을 반복하므로 장면 전환 감지는 불필요 - 고정 GOP로 인코딩
+X264_PARAMS = "keyint=240:min-keyint=240:scenecut=0"
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_hw_encoder() -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    실제로 동작하는 하드웨어 인코더 감지 (처음 인코딩할 때 한 번만 실행)
+    빌드에 포함돼 있어도 장치가 없으면 실패하므로 짧은 테스트 인코딩까지 확인
+    """
+    try:
+        result = subprocess.run(
+            [FFMPEG, '-hide_banner', '-encoders'], capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        
+        for encoder, args in HW_ENCODER_CANDIDATES:
+            if encoder not in result.stdout:
+                continue
+            
+            test_cmd = [
+                FFMPEG, '-v', 'error',
+                '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                '-c:v', encoder, *args,
+                '-f', 'null', '-'
+            ]
+            if subprocess.run(test_cmd, capture_output=True).returncode == 0:
+                print(f"🚀 하드웨어 인코더 사용: {encoder}")
+                return encoder, args
+    except Exception as e:
+        print(f"⚠️ 하드웨어 인코더 감지 실패: {str(e)}")
+    return None
+
+
+def _video_codec_args(preset: str = 'veryfast') -> List[str]:
+    """비디오 인코딩 인자 (하드웨어 인코더가 있으면 사용, 없으면 libx264)"""
+    hw_encoder = _detect_hw_encoder()
+    if hw_encoder:
+        encoder, args = hw_encoder
+        return ['-c:v', encoder, *args]
+    return ['-c:v', 'libx264', '-preset', preset, '-crf', '23', '-x264-params', X264_PARAMS]
+
+
+# FFmpeg 오류 진단용으로 보관할 stderr 마지막 줄 수
+FFMPEG_STDERR_TAIL = 200
+
+
+def _run_ffmpeg(cmd: List[str], timeout: Optional[float] = None, tail: int = FFMPEG_STDERR_TAIL) -> subprocess.CompletedProcess:
+    """
+    FFmpeg 실행 (stderr는 백그라운드 스레드가 읽으면서 마지막 tail줄만 보관)
+    긴 인코딩에서도 메모리가 늘어나지 않음. 시간 초과 시 프로세스를 종료하고 TimeoutExpired 발생
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
+    )
+    stderr_tail: deque = deque(maxlen=tail)
+    
+    def _drain():
+        for line in process.stderr:
+            stderr_tail.append(line.rstrip())
+    
+    drainer = threading.Thread(target=_drain, daemon=True)
+    drainer.start()
+    
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        drainer.join()
+        process.stderr.close()
+    
+    return subprocess.CompletedProcess(cmd, returncode, stdout=None, stderr="\n".join(stderr_tail))
+
+
+# 최종 인코딩 제한 시간 = 음성 길이 × 배수 (인코더와 관계없이 적용, 초과하면 실패)
+ENCODE_TIMEOUT_FACTOR = 2.0
+MIN_ENCODE_TIMEOUT = 30.0
+# 이 길이(초)를 넘는 음성은 처음부터 libx264 ultrafast로 인코딩 (제한 시간 안에 끝나도록)
+LONG_AUDIO_THRESHOLD = 600.0
+
+
+def _encode_preset(audio_duration: float) -> str:
+    """최종 인코딩의 libx264 프리셋 - 긴 음성은 화질보다 속도 우선 (하드웨어 인코더는 무시)"""
+    return 'ultrafast' if audio_duration > LONG_AUDIO_THRESHOLD else 'superfast'
+
+
+def _run_encode(cmd: List[str], audio_duration: float) -> subprocess.CompletedProcess:
+    """인코딩 실행 - 제한 시간을 넘기면 FFmpeg를 종료하고 TimeoutExpired 발생 (재시도 없음)"""
+    timeout = max(MIN_ENCODE_TIMEOUT, audio_duration * ENCODE_TIMEOUT_FACTOR)
+    
+    try:
+        return _run_ffmpeg(cmd, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"⏱️ 인코딩이 제한 시간 {timeout:.0f}초를 넘어 중단됨")
+        raise
+
+
+# 재인코딩 없이 MP4로 그대로 복사할 수 있는 비디오 코덱
+STREAM_COPY_CODECS = ("h264", "hevc")
+
+
+def create_basic_looped_video(
+    template_path: str,
+    audio_duration: float,
+    template_duration: float,
+    output_temp_path: str,
+    plan: Optional[LoopPlan] = None
+) -> bool:
     """기본 루프 비디오 생성 (트랜지션 없음)"""
     try:
         # 필요한 총 루프 횟수 계산 (오디오 길이에 맞게)
-        loops_needed = math.ceil(audio_duration / template_duration)
+        loops_needed, additional_loops, _ = plan or _plan_loops(audio_duration, template_duration)
         
         print(f"🔄 기본 루프 비디오 생성:")
         print(f"   필요한 루프: {loops_needed}회")
         print(f"   템플릿 길이: {template_duration:.2f}초")
         print(f"   오디오 길이: {audio_duration:.2f}초")
         
-        # 두 단계로 나누어 처리
-        # 1. 먼저 템플릿을 복사하여 준비
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_single_loop:
-            single_loop_path = temp_single_loop.name
-        
-        # 템플릿 복사 (트랜지션 없이)
-        copy_cmd = [
-            'ffmpeg',
-            '-i', template_path,
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
-            '-an',  # 오디오 제거
-            '-y',
-            single_loop_path
-        ]
-        
-        result = subprocess.run(copy_cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"⚠️ 템플릿 복사 실패: {result.stderr}")
-            if os.path.exists(single_loop_path):
-                os.unlink(single_loop_path)
-            return False
+        # 필터가 없으므로 템플릿이 이미 H.264/HEVC면 스트림 복사 (디코딩/인코딩 없음)
+        if _probe_video_codec(template_path) in STREAM_COPY_CODECS:
+            codec_args = ['-c:v', 'copy']
+        else:
+            codec_args = _video_codec_args()
         
-        # 2. 복사된 템플릿을 여러 번 반복하여 최종 비디오 생성
+        # 템플릿을 바로 반복하여 최종 비디오 생성
         loop_cmd = [
-            'ffmpeg',
-            '-stream_loop', str(loops_needed - 1),  # 첫 번째 루프는 이미 포함되어 있으므로 -1
-            '-i', single_loop_path,
+            FFMPEG,
+            '-stream_loop', str(additional_loops),  # 첫 번째 루프는 원본이므로 -1
+            '-i', template_path,
             '-t', str(audio_duration),  # 오디오 길이로 자름
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
+            *codec_args,
             '-an',  # 오디오 제거 (최종 비디오에서는 원본 오디오 사용)
             '-y',
             output_temp_path
         ]
         
-        result = subprocess.run(loop_cmd, capture_output=True, text=True)
-        
-        # 임시 파일 삭제
-        if os.path.exists(single_loop_path):
-            os.unlink(single_loop_path)
+        result = _run_ffmpeg(loop_cmd)
             
         if result.returncode != 0:
             print(f"⚠️ 루프 비디오 생성 실패: {result.stderr}")
@@ -399,33 +891,31 @@ def create_looped_template_video(
     """🆕 Phase 3.2.3: 트랜지션 효과가 포함된 템플릿 기반 루프 비디오 + 자막 생성"""
     
     if template_manager is None:
-        template_manager = TemplateManager()
+        template_manager = get_template_manager()
     
     try:
         # 1. 템플릿 검증
         if not template_manager.validate_template(template_name):
             raise Exception(f"템플릿 '{template_name}'을 사용할 수 없습니다")
         
-        # 2. 음성 길이 가져오기
+        # 2~3. 음성 길이와 템플릿 정보(길이 포함)를 동시에 감지 (서로 독립적인 프로브)
+        template_future = _probe_executor.submit(template_manager.resolve, template_name)
         audio_duration = get_audio_duration(audio_path)
         if audio_duration <= 0:
             raise Exception(f"음성 파일 길이를 확인할 수 없습니다: {audio_path}")
         
-        # 3. 템플릿 정보 및 길이 감지
-        template_duration = template_manager.get_template_duration(template_name)
-        template_path = template_manager.get_template_path(template_name)
-        template_info = template_manager.get_template_info(template_name)
+        template_info = template_future.result()
+        if template_info is None:
+            raise Exception(f"템플릿 '{template_name}' 정보를 찾을 수 없습니다")
+        template_duration = template_info.duration
+        template_path = template_info.path
         
-        # 4. 🆕 트랜지션 설정 결정
+        # 4. 🆕 트랜지션 설정 결정 (없으면 템플릿 기본 설정 사용)
         if transition_config is None:
-            # 템플릿 기본 설정 사용
-            if template_info:
-                transition_config = TransitionConfig(
-                    type=template_info.recommended_transition,
-                    duration=template_info.optimal_transition_duration
-                )
-            else:
-                transition_config = TransitionConfig()  # 기본값 사용
+            transition_config = TransitionConfig(
+                type=template_info.recommended_transition,
+                duration=template_info.optimal_transition_duration
+            )
         
         # 5. 해상도 설정
         resolution_configs = {
@@ -444,51 +934,56 @@ def create_looped_template_video(
         print(f"   템플릿 길이: {template_duration:.2f}초")
         print(f"   트랜지션: {transition_config.type} ({transition_config.duration:.1f}초)")
         
-        # 6. 🆕 트랜지션 효과가 있는 루프 비디오 생성
-        temp_video_path = None
-        
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video_file:
-            temp_video_path = temp_video_file.name
-        
-        # 트랜지션 비디오 생성
-        if not create_seamless_looped_video(
-            template_path, audio_duration, template_duration, 
-            transition_config, temp_video_path
-        ):
-            raise Exception("트랜지션 비디오 생성 실패")
-        
-        # 7. ASS 파일 임시 저장
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.ass', delete=False, encoding='utf-8') as ass_file:
-            ass_file.write(ass_content)
-            ass_path = ass_file.name
-        
-        # 8. 최종 비디오 생성 (트랜지션 비디오 + 음성 + 자막)
-        cmd = [
-            'ffmpeg',
-            '-i', temp_video_path,                  # 트랜지션 처리된 비디오
-            '-i', audio_path,                       # 음성 파일
-            '-vf', f'ass={ass_path},scale={config["size"]}',  # 자막 + 해상도 조정
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-map', '0:v',                          # 첫 번째 입력에서 비디오 스트림 사용
-            '-map', '1:a',                          # 두 번째 입력에서 오디오 스트림 사용
-            '-t', str(audio_duration),              # 음성 길이로 자름
-            '-shortest',
-            '-y',
-            output_path
-        ]
-        
-        # 9. FFmpeg 실행
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        # 10. 임시 파일 정리
-        if temp_video_path and os.path.exists(temp_video_path):
-            os.unlink(temp_video_path)
-        if ass_path and os.path.exists(ass_path):
-            os.unlink(ass_path)
+        # 6. ASS 파일 임시 저장 (가능하면 메모리 기반 tmpfs, 블록을 벗어나면 자동 삭제)
+        # libass는 파일 크기를 먼저 확인하므로 파이프(/dev/fd)로는 넘길 수 없음
+        with _ffmpeg_tempfile('.ass', ass_content.encode('utf-8'), in_memory=True) as ass_path:
+            # 7. 트랜지션이 필요 없으면 루프 + 해상도 조정 + 자막을 FFmpeg 한 번으로 인코딩
+            plan = _plan_loops(audio_duration, template_duration, transition_config.duration)
+            if _render_fused(
+                template_path, audio_path, output_path, ass_path, ass_content,
+                audio_duration, transition_config, plan, config["size"]
+            ):
+                print(f"✅ 트랜지션 템플릿 비디오 생성 완료 (단일 인코딩): {output_path}")
+                return True
+            
+            # 8. (대체 경로) 트랜지션 효과가 있는 루프 비디오를 먼저 생성
+            with _ffmpeg_tempfile('.mp4') as temp_video_path:
+                if not create_seamless_looped_video(
+                    template_path, audio_duration, template_duration, 
+                    transition_config, temp_video_path, plan
+                ):
+                    raise Exception("트랜지션 비디오 생성 실패")
+                
+                # 9. 최종 비디오 생성 (트랜지션 비디오 + 음성 + 자막)
+                filters = []
+                if ass_content.strip():
+                    filters.append(f'ass={ass_path}')            # 자막
+                if _probe_resolution(temp_video_path) != config["size"]:
+                    filters.append(f'scale={config["size"]}')  # 해상도가 다를 때만 조정
+                
+                if filters:
+                    video_args = ['-vf', ",".join(filters), *_video_codec_args(_encode_preset(audio_duration))]
+                else:
+                    # 자막도 해상도 조정도 필요 없으면 비디오는 스트림 복사
+                    video_args = ['-c:v', 'copy']
+                
+                cmd = [
+                    FFMPEG,
+                    '-i', temp_video_path,                  # 트랜지션 처리된 비디오
+                    '-i', audio_path,                       # 음성 파일
+                    *video_args,
+                    '-c:a', 'aac',
+                    '-b:a', '128k',
+                    '-map', '0:v',                          # 첫 번째 입력에서 비디오 스트림 사용
+                    '-map', '1:a',                          # 두 번째 입력에서 오디오 스트림 사용
+                    '-t', str(audio_duration),              # 음성 길이로 자름
+                    '-shortest',
+                    '-y',
+                    output_path
+                ]
+                
+                # 10. FFmpeg 실행
+                result = _run_encode(cmd, audio_duration)
         
         if result.returncode != 0:
             raise Exception(f"최종 비디오 생성 실패: {result.stderr}")
@@ -497,47 +992,178 @@ def create_looped_template_video(
         return True
         
     except Exception as e:
-        # 임시 파일 정리
-        if 'temp_video_path' in locals() and temp_video_path and os.path.exists(temp_video_path):
-            os.unlink(temp_video_path)
-        if 'ass_path' in locals() and ass_path and os.path.exists(ass_path):
-            os.unlink(ass_path)
-        
         print(f"❌ 트랜지션 템플릿 비디오 생성 실패: {str(e)}")
         return False
 
 
+def _render_fused(
+    template_path: str,
+    audio_path: str,
+    output_path: str,
+    ass_path: str,
+    ass_content: str,
+    audio_duration: float,
+    transition_config: TransitionConfig,
+    plan: LoopPlan,
+    size: str
+) -> bool:
+    """
+    루프 + 해상도 조정 + 자막 + 음성을 FFmpeg 한 번으로 렌더링 (실패 시 False)
+    트랜지션은 효과를 넣은 한 주기를 먼저 만들어 반복해야 하므로 단계별 방식 사용
+    (create_crossfade_loop / create_fade_loop 참고)
+    """
+    loops_needed, additional_loops, _ = plan
+    if transition_config.type != "none" and loops_needed > 1:
+        return False
+    
+    input_args = _stream_loop_args(template_path, additional_loops)
+    has_subtitles = bool(ass_content.strip())
+    # 템플릿이 이미 목표 해상도면 프레임마다 하는 스케일링 생략
+    needs_scale = _probe_resolution(template_path) != size
+    
+    if not has_subtitles and not needs_scale and _probe_video_codec(template_path) in STREAM_COPY_CODECS:
+        # 필터가 하나도 필요 없으면 비디오는 스트림 복사
+        video_args = ['-map', '0:v', '-c:v', 'copy']
+    else:
+        filters = []
+        # 작은 템플릿이면 -stream_loop 대신 메모리 안 반복으로 바꿔 한 번만 디코딩
+        loop_filter = _buffered_loop_filter(template_path, additional_loops)
+        if loop_filter:
+            input_args = ['-i', template_path]
+            filters.append(loop_filter)
+        if needs_scale:
+            filters.append(f'scale={size}')
+        if has_subtitles:
+            filters.append(f'ass={ass_path}')
+        video_args = [
+            '-filter_complex', f'[0:v]{",".join(filters) or "null"}[v]',
+            '-map', '[v]',
+            *_video_codec_args(_encode_preset(audio_duration))
+        ]
+    
+    fused_cmd = [
+        FFMPEG,
+        *input_args,                            # 템플릿 (반복 포함)
+        '-i', audio_path,                       # 음성 파일
+        *video_args,
+        '-map', '1:a',
+        '-c:a', 'aac',
+        '-b:a', '128k',
+        '-t', str(audio_duration),              # 음성 길이로 자름
+        '-y',
+        output_path
+    ]
+    
+    result = _run_encode(fused_cmd, audio_duration)
+    if result.returncode != 0:
+        print(f"⚠️ 단일 파이프라인 실패, 단계별 방식으로 재시도: {result.stderr}")
+        return False
+    return True
+
+
+def _probe_media_duration(media_path: str) -> Optional[float]:
+    """
+    미디어 길이 감지 (실패 시 None)
+    PyAV → mutagen(오디오 전용) 순으로 프로세스 내에서 헤더만 읽고, 둘 다 안 되면 FFprobe 실행
+    """
+    if AV_AVAILABLE:
+        try:
+            with av.open(media_path) as container:
+                if container.duration:
+                    return container.duration / av.time_base
+        except Exception:
+            pass
+    
+    if MUTAGEN_AVAILABLE:
+        try:
+            audio_file = mutagen.File(media_path)
+            if audio_file is not None and audio_file.info.length > 0:
+                return float(audio_file.info.length)
+        except Exception:
+            pass
+    
+    cmd = [
+        FFPROBE, 
+        '-v', 'quiet', 
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        media_path
+    ]
+    
+    try:
+        output = _run_ffprobe(cmd).strip()
+        if output:
+            return float(output)
+    except RuntimeError as e:
+        print(f"⚠️ FFprobe 실행 실패: {str(e)}")
+    return None
+
+
+def _run_ffprobe(cmd: List[str]) -> bytes:
+    """
+    FFprobe 실행 후 stdout 바이트 반환 (텍스트 디코딩/stderr 파이프 없음)
+    실패했을 때만 오류 메시지를 보이게 해서 한 번 더 실행하고 RuntimeError 발생
+    """
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if result.returncode == 0:
+        return result.stdout
+    
+    verbose_cmd = ['error' if arg == 'quiet' else arg for arg in cmd]
+    retry = subprocess.run(verbose_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    raise RuntimeError(retry.stderr.decode('utf-8', errors='replace').strip() or f"종료 코드 {result.returncode}")
+
+
+# 렌더링 전 프로브(음성 길이/템플릿 길이)를 동시에 실행할 스레드 풀
+# 서브프로세스 대기나 헤더 읽기 중에는 GIL이 풀리므로 스레드로 충분
+_probe_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="template-probe")
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_audio_duration(audio_path: str, mtime_ns: int) -> float:
+    """오디오 길이 감지 (경로 + 수정 시각 기준으로 캐시, 실패는 캐시하지 않음)"""
+    duration = _probe_media_duration(audio_path)
+    if duration is None:
+        raise RuntimeError(f"음성 길이 감지 실패: {audio_path}")
+    return duration
+
+
 def get_audio_duration(audio_path: str) -> float:
     """오디오 길이 구하기"""
     try:
-        cmd = [
-            'ffprobe', 
-            '-v', 'quiet', 
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            audio_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-        else:
-            print(f"⚠️ 음성 길이 감지 실패: {result.stderr}")
-            return 60.0  # 기본값
-            
+        return _probe_audio_duration(audio_path, os.stat(audio_path).st_mtime_ns)
+    except RuntimeError as e:
+        print(f"⚠️ {str(e)}")
+        return 60.0  # 기본값
     except Exception as e:
         print(f"❌ 음성 길이 감지 오류: {str(e)}")
         return 60.0  # 기본값
 
 
-# 전역 템플릿 매니저 인스턴스
-template_manager = TemplateManager()
+# 전역 템플릿 매니저 인스턴스 (처음 사용할 때 생성 - 임포트만으로는 설정 파일을 읽지 않음)
+_template_manager: Optional[TemplateManager] = None
+
+
+def get_template_manager() -> TemplateManager:
+    """전역 템플릿 매니저 반환 (없으면 생성)"""
+    global _template_manager
+    if _template_manager is None:
+        _template_manager = TemplateManager()
+    return _template_manager
+
+
+def __getattr__(name: str):
+    # 기존 `from phase3_templates import template_manager` 호환 (PEP 562)
+    if name == "template_manager":
+        return get_template_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     # 🧪 Phase 3.2.3 트랜지션 테스트
     print("🧪 Phase 3.2.3 트랜지션 템플릿 매니저 테스트")
     
+    template_manager = get_template_manager()
+    
     # 사용 가능한 템플릿 목록
     templates = template_manager.get_available_templates()
     print(f"📋 사용 가능한 템플릿: {templates}")
@@ -2,26 +2,78 @@
 간단한 GPT 후처리 모듈 (의존성 최소화)
 """
 import asyncio
+import hashlib
+import json
 import os
-from typing import Dict, List
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
+import httpx
 import logging
 
+# h2 패키지가 있으면 HTTP/2로 동시 교정 요청을 하나의 연결에 다중화
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 교정 원칙 (단일 텍스트/세그먼트 일괄 교정 공통)
+CORRECTION_PRINCIPLES = """당신은 한국어 전문 교정자입니다. 음성 인식 결과의 오타와 맞춤법을 교정해주세요.
+
+**교정 원칙:**
+1. **음성학적 오류 수정**: "되요" → "돼요", "웬지" → "왠지", "계시다" → "가시다"
+2. **띄어쓰기 정규화**: "할수있다" → "할 수 있다", 자연스러운 한국어 띄어쓰기
+3. **맞춤법 교정**: 표준 한국어 맞춤법 준수
+4. **문장 부호 최적화**: 자연스러운 쉼표, 마침표 배치
+5. **원본 의미 보존**: 절대 의미를 변경하지 마세요"""
+
+# 세그먼트 일괄 교정용 응답 형식 안내
+BATCH_FORMAT_INSTRUCTIONS = """
+
+입력은 {"segments": [{"id": 번호, "text": "원문"}, ...]} 형식의 JSON입니다.
+각 세그먼트를 따로 교정하고, 세그먼트를 합치거나 나누지 마세요.
+결과는 같은 id를 유지한 {"segments": [{"id": 번호, "text": "교정문"}, ...]} JSON만 출력하세요."""
+
+# 한국어 문장 분할 패턴: 마침표, 느낌표, 물음표 뒤의 공백이나 줄바꿈 / 쉼표, 세미콜론 뒤의 공백
+_SENT_RE = re.compile(r'[.!?]\s+')
+_COMMA_RE = re.compile(r'[,;]\s+')
+
+# 동시에 보낼 최대 API 요청 수 / 한 번의 일괄 교정 요청에 담을 최대 세그먼트 수
+MAX_CONCURRENT_REQUESTS = 8
+BATCH_SEGMENTS = 40
+
+# 교정 요청들이 공유하는 커넥션 풀 (동시 요청 수보다 넉넉하게)
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# 최근 교정 결과를 기억할 최대 개수 (같은 텍스트를 다시 렌더링할 때 API 호출 생략)
+CORRECTION_CACHE_SIZE = 128
+
 class SimpleGPTPostProcessor:
     def __init__(self):
         load_dotenv()
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.client = None
         self.is_enabled = False
+        # 원문 해시 → 교정문 (LRU)
+        self._correction_cache: "OrderedDict[str, str]" = OrderedDict()
         
         if self.api_key and self.api_key != "your_openai_api_key_here":
             try:
-                self.client = AsyncOpenAI(api_key=self.api_key)
+                # 하나의 커넥션 풀을 앱 수명 동안 재사용 (동시 요청마다 TLS 핸드셰이크 반복 방지)
+                self.client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    http_client=httpx.AsyncClient(
+                        http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+                    )
+                )
                 self.is_enabled = True
                 logger.info("✅ 간단한 GPT 후처리 모듈 초기화 완료")
             except Exception as e:
@@ -34,6 +86,24 @@ class SimpleGPTPostProcessor:
         """GPT 후처리 사용 가능 여부 확인"""
         return self.is_enabled and self.client is not None
     
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.blake2b(text.strip().encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _cached_correction(self, text: str) -> Optional[str]:
+        """이전에 교정한 같은 텍스트의 결과 (없으면 None)"""
+        key = self._cache_key(text)
+        corrected = self._correction_cache.get(key)
+        if corrected is not None:
+            self._correction_cache.move_to_end(key)
+        return corrected
+    
+    def _remember_correction(self, text: str, corrected: str):
+        """교정 결과 저장 (오래된 항목부터 제거)"""
+        self._correction_cache[self._cache_key(text)] = corrected
+        if len(self._correction_cache) > CORRECTION_CACHE_SIZE:
+            self._correction_cache.popitem(last=False)
+    
     async def correct_text(self, text: str) -> Dict:
         """단일 텍스트 교정"""
         if not self.is_available():
@@ -52,19 +122,20 @@ class SimpleGPTPostProcessor:
                 "correction_applied": False
             }
         
+        cached = self._cached_correction(text)
+        if cached is not None:
+            logger.info("✅ 이전 교정 결과 재사용")
+            return {
+                "success": True,
+                "corrected_text": cached,
+                "original_text": text,
+                "correction_applied": cached != text
+            }
+        
         try:
             logger.info(f"🔄 GPT로 텍스트 교정 중... (길이: {len(text)}자)")
             
-            system_prompt = """당신은 한국어 전문 교정자입니다. 음성 인식 결과의 오타와 맞춤법을 교정해주세요.
-
-**교정 원칙:**
-1. **음성학적 오류 수정**: "되요" → "돼요", "웬지" → "왠지", "계시다" → "가시다"
-2. **띄어쓰기 정규화**: "할수있다" → "할 수 있다", 자연스러운 한국어 띄어쓰기
-3. **맞춤법 교정**: 표준 한국어 맞춤법 준수
-4. **문장 부호 최적화**: 자연스러운 쉼표, 마침표 배치
-5. **원본 의미 보존**: 절대 의미를 변경하지 마세요
-
-교정된 텍스트만 출력하세요. 추가 설명 없이 결과만 제공하세요."""
+            system_prompt = CORRECTION_PRINCIPLES + "\n\n교정된 텍스트만 출력하세요. 추가 설명 없이 결과만 제공하세요."
             
             response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
@@ -82,6 +153,7 @@ class SimpleGPTPostProcessor:
             # 기본 품질 체크
             if len(corrected_text) < len(text) * 0.3:
                 logger.warning("⚠️ 교정된 텍스트가 너무 짧습니다. 원본을 유지합니다.")
+                self._remember_correction(text, text)
                 return {
                     "success": True,
                     "corrected_text": text,
@@ -91,6 +163,7 @@ class SimpleGPTPostProcessor:
                 }
             
             logger.info("✅ GPT 텍스트 교정 완료")
+            self._remember_correction(text, corrected_text)
             return {
                 "success": True,
                 "corrected_text": corrected_text,
@@ -203,12 +276,7 @@ class SimpleGPTPostProcessor:
     
     def _split_sentences(self, text: str) -> List[str]:
         """텍스트를 문장 단위로 분할 (더 정확한 분할)"""
-        import re
-        
-        # 한국어 문장 분할 패턴 (더 정교하게)
-        # 마침표, 느낌표, 물음표 뒤의 공백이나 줄바꿈
-        sentence_endings = r'[.!?]\s+'
-        sentences = re.split(sentence_endings, text.strip())
+        sentences = _SENT_RE.split(text.strip())
         
         # 빈 문장 제거 및 정리
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -216,7 +284,7 @@ class SimpleGPTPostProcessor:
         # 문장이 너무 적으면 더 세분화
         if len(sentences) == 1 and len(text) > 100:
             # 쉼표나 세미콜론으로도 분할 시도
-            comma_split = re.split(r'[,;]\s+', text.strip())
+            comma_split = _COMMA_RE.split(text.strip())
             if len(comma_split) > 1:
                 sentences = [s.strip() for s in comma_split if s.strip()]
         
@@ -234,38 +302,64 @@ class SimpleGPTPostProcessor:
             }
         
         try:
-            logger.info(f"🔄 {len(segments)}개 세그먼트 개별 교정 중...")
+            logger.info(f"🔄 {len(segments)}개 세그먼트 일괄 교정 중...")
+            
+            # 이전에 교정한 세그먼트는 캐시에서 바로 가져오고 나머지만 요청
+            corrections = {}
+            items = []
+            for i, segment in enumerate(segments):
+                text = segment.get("text", "").strip()
+                if not text:
+                    continue
+                cached = self._cached_correction(text)
+                if cached is not None:
+                    corrections[i] = cached
+                else:
+                    items.append((i, text))
+            
+            # 세그먼트를 묶음 단위로 한 번씩 교정 (묶음들은 동시에 요청, 실패한 묶음만 세그먼트별 교정)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            
+            async def _correct_group(group: List[Tuple[int, str]]) -> Dict[int, str]:
+                async with semaphore:
+                    try:
+                        group_corrections = await self._correct_batch(group)
+                    except Exception as e:
+                        logger.warning(f"⚠️ 일괄 교정 실패, 세그먼트별 교정으로 대체: {e}")
+                        group_corrections = {}
+                # 응답에서 빠진 세그먼트만 세그먼트별 교정
+                missing = [item for item in group if item[0] not in group_corrections]
+                if missing:
+                    if group_corrections:
+                        logger.warning(f"⚠️ 일괄 교정 응답에서 {len(missing)}개 세그먼트 누락, 세그먼트별 교정으로 대체")
+                    group_corrections.update(await self._correct_individually(missing, semaphore))
+                return group_corrections
+            
+            for group_corrections in await asyncio.gather(*(
+                _correct_group(items[k:k + BATCH_SEGMENTS])
+                for k in range(0, len(items), BATCH_SEGMENTS)
+            )):
+                corrections.update(group_corrections)
             
             corrected_segments = []
             total_corrections = 0
             
-            # 각 세그먼트를 개별적으로 교정 (타임스탬프 보존)
             for i, segment in enumerate(segments):
                 original_text = segment.get("text", "").strip()
+                corrected_text = corrections.get(i)
                 
-                if not original_text:
-                    corrected_segments.append(segment.copy())
-                    continue
-                
-                # 개별 텍스트 교정
-                correction_result = await self.correct_text(original_text)
-                
-                if correction_result["success"] and correction_result["correction_applied"]:
+                if corrected_text and corrected_text != original_text:
                     # 교정된 텍스트로 업데이트 (타임스탬프는 그대로 유지)
-                    corrected_segment = {
+                    corrected_segments.append({
                         "start": segment.get("start", 0),
                         "end": segment.get("end", 0),
-                        "text": correction_result["corrected_text"]
-                    }
-                    corrected_segments.append(corrected_segment)
+                        "text": corrected_text
+                    })
                     total_corrections += 1
-                    logger.info(f"  📝 세그먼트 {i+1}: '{original_text}' → '{correction_result['corrected_text']}'")
+                    logger.info(f"  📝 세그먼트 {i+1}: '{original_text}' → '{corrected_text}'")
                 else:
                     # 교정이 적용되지 않은 경우 원본 유지
                     corrected_segments.append(segment.copy())
-                
-                # API 제한 방지용 짧은 대기
-                await asyncio.sleep(0.1)
             
             logger.info(f"✅ 개별 세그먼트 교정 완료: {total_corrections}개 수정됨")
             
@@ -287,5 +381,69 @@ class SimpleGPTPostProcessor:
                 "total_corrections": 0
             }
 
-# 전역 인스턴스
-simple_gpt_postprocessor = SimpleGPTPostProcessor()
+    async def _correct_batch(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        """
+        세그먼트들을 JSON 한 번의 요청으로 교정 (세그먼트 번호 → 교정문)
+        응답에 포함된 세그먼트만 반환/캐시 (빠진 세그먼트는 호출한 쪽에서 따로 교정)
+        """
+        if not items:
+            return {}
+        
+        payload = json.dumps(
+            {"segments": [{"id": i, "text": text} for i, text in items]},
+            ensure_ascii=False
+        )
+        
+        response = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": CORRECTION_PRINCIPLES + BATCH_FORMAT_INSTRUCTIONS},
+                {"role": "user", "content": payload}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1,
+            max_tokens=min(16000, 1000 + 2 * len(payload)),
+            timeout=60.0
+        )
+        
+        originals = dict(items)
+        corrections = {}
+        for entry in json.loads(response.choices[0].message.content)["segments"]:
+            i, text = int(entry["id"]), str(entry["text"]).strip()
+            if i not in originals:
+                continue
+            # 기본 품질 체크 (너무 짧아진 교정문은 버리고 원본 유지)
+            corrections[i] = text if len(text) >= len(originals[i]) * 0.3 else originals[i]
+            self._remember_correction(originals[i], corrections[i])
+        return corrections
+    
+    async def _correct_individually(self, items: List[Tuple[int, str]], semaphore: asyncio.Semaphore) -> Dict[int, str]:
+        """세그먼트별로 따로 교정 (일괄 교정 실패 시 대체 경로, 동시 요청 수는 semaphore로 제한)"""
+        async def _correct_one(text: str) -> Dict:
+            async with semaphore:
+                return await self.correct_text(text)
+        
+        results = await asyncio.gather(*(_correct_one(text) for _, text in items))
+        return {
+            i: result["corrected_text"]
+            for (i, _), result in zip(items, results)
+            if result["success"] and result.get("correction_applied")
+        }
+
+# 전역 인스턴스 (처음 사용할 때 생성 - 임포트만으로는 .env 로드/클라이언트 생성을 하지 않음)
+_simple_gpt_postprocessor: Optional[SimpleGPTPostProcessor] = None
+
+
+def get_simple_gpt_postprocessor() -> SimpleGPTPostProcessor:
+    """전역 GPT 후처리기 반환 (없으면 생성)"""
+    global _simple_gpt_postprocessor
+    if _simple_gpt_postprocessor is None:
+        _simple_gpt_postprocessor = SimpleGPTPostProcessor()
+    return _simple_gpt_postprocessor
+
+
+def __getattr__(name: str):
+    # 기존 `from simple_gpt_postprocessor import simple_gpt_postprocessor` 호환 (PEP 562)
+    if name == "simple_gpt_postprocessor":
+        return get_simple_gpt_postprocessor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
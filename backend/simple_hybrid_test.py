@@ -4,34 +4,25 @@
 """
 import os
 import sys
-import asyncio
-from dotenv import load_dotenv
-from openai import OpenAI
-from faster_whisper import WhisperModel
+from test_common import API_KEY_CONFIGURED, get_client, get_whisper_model, run
 
 async def test_openai_api_direct(audio_path: str):
     """OpenAI API 직접 테스트"""
-    load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not api_key or api_key == "your_openai_api_key_here":
+    if not API_KEY_CONFIGURED:
         print("⚠️ OpenAI API 키가 설정되지 않음")
         return None
     
     try:
-        client = OpenAI(api_key=api_key)
-        
-        def call_api():
-            with open(audio_path, "rb") as audio_file:
-                return client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ko",
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment"]
-                )
+        client = get_client()
         
-        result = await asyncio.to_thread(call_api)
+        with open(audio_path, "rb") as audio_file:
+            result = await client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                language="ko",
+                response_format="verbose_json",
+                timestamp_granularities=["segment"]
+            )
         
         return {
             "method": "openai_api",
@@ -47,8 +38,16 @@ async def test_openai_api_direct(audio_path: str):
 def test_local_whisper_direct(audio_path: str):
     """로컬 Whisper 직접 테스트"""
     try:
-        model = WhisperModel("large-v3", device="cpu", compute_type="int8")
-        segments, info = model.transcribe(audio_path, language="ko")
+        model = get_whisper_model()
+        # 무음 구간은 VAD로 건너뛰고, 짧은 클립에서는 greedy 디코딩(beam_size=1)으로 충분
+        segments, info = model.transcribe(
+            audio_path,
+            language="ko",
+            vad_filter=True,
+            vad_parameters={"min_silence_duration_ms": 500},
+            beam_size=1,
+            condition_on_previous_text=False
+        )
         
         full_text = ""
         segment_count = 0
@@ -157,4 +156,4 @@ async def main():
         print("💥 모든 테스트 실패")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -5,25 +5,39 @@ OpenAI Whisper API 안정성 테스트
 """
 import os
 import asyncio
-from dotenv import load_dotenv
-from openai import OpenAI
+from test_common import (
+    API_KEY_CONFIGURED, get_client, cached_transcription, make_rate_limiter,
+    prepare_transcription, read_audio_bytes, run
+)
 import sys
+import hashlib
 from collections import Counter
+from pathlib import Path
 
-# 환경변수 로드
-load_dotenv()
+# 이만큼 연속으로 같은 결과가 나오면 결정적이라고 보고 남은 호출 생략
+EARLY_STOP_MATCHES = 3
 
-async def test_api_consistency(audio_file_path: str, num_tests: int = 5):
-    """동일한 파일을 여러 번 API 호출하여 일관성 테스트"""
+def _text_digest(text: str) -> bytes:
+    """긴 전사 텍스트는 한 번만 해시해서 비교/빈도 집계에 사용"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+async def test_api_consistency(audio_file_path: str, num_tests: int = 5, concurrency: int = 3,
+                               use_cache: bool = True, early_stop: bool = True):
+    """동일한 파일을 여러 번 API 호출하여 일관성 테스트
+    
+    use_cache=True면 (오디오, 파라미터, 호출 번호)별로 이전 실행 결과를 재사용
+    (실제 일관성 측정 시에는 --no-cache로 실행)
+    early_stop=True면 처음 완료된 결과들이 EARLY_STOP_MATCHES회 모두 같을 때
+    남은 호출을 취소 (결과가 다르면 끝까지 실행)
+    """
     
     # API 키 확인
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or api_key == "your_openai_api_key_here":
+    if not API_KEY_CONFIGURED:
         print("❌ OpenAI API 키가 설정되지 않았습니다.")
         return False
     
-    # OpenAI 클라이언트 초기화
-    client = OpenAI(api_key=api_key)
+    # 공유 클라이언트 (테스트 전체에서 하나의 커넥션 풀 재사용)
+    client = get_client()
     print(f"✅ OpenAI 클라이언트 초기화 완료")
     
     # 파일 존재 확인
@@ -33,58 +47,98 @@ async def test_api_consistency(audio_file_path: str, num_tests: int = 5):
     
     file_size = os.path.getsize(audio_file_path)
     print(f"📁 파일 정보: {os.path.basename(audio_file_path)} ({file_size/1024:.1f}KB)")
-    print(f"🔄 {num_tests}회 반복 테스트 시작")
+    print(f"🔄 {num_tests}회 반복 테스트 시작 (동시 호출 최대 {concurrency}개)")
+    
+    # 파일은 한 번만 읽어서 모든 호출에서 재사용
+    audio_name = Path(audio_file_path).name
+    audio_bytes = read_audio_bytes(audio_file_path)
+    
+    # 동시 호출 수 제한 + 분당 요청 수 제한 (고정 대기 대신 토큰 버킷)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = make_rate_limiter()
+    
+    # API 호출 파라미터 (프롬프트 없이 순수 인식)
+    params = dict(
+        model="whisper-1",
+        language="ko",  # 한국어 고정
+        response_format="verbose_json",
+        timestamp_granularities=["segment"],
+        temperature=0.0  # 일관성을 위해 0으로 고정
+        # prompt 사용하지 않음 - 실제 오디오만 인식
+    )
+    
+    if use_cache:
+        print("💾 캐시 사용 (실제 API 재측정은 --no-cache)")
+        transcribe = cached_transcription(client.audio.transcriptions.create)
+    else:
+        # 매번 같은 요청이므로 multipart 본문은 한 번만 인코딩해서 반복 전송
+        send = prepare_transcription(file=(audio_name, audio_bytes), **params)
+    
+    async def one_call(i: int):
+        async with semaphore, limiter:
+            try:
+                if use_cache:
+                    return i, await transcribe(call_index=i, file=(audio_name, audio_bytes), **params)
+                return i, await send()
+            except Exception as e:
+                return i, e
     
     results = []
     
     try:
-        for i in range(num_tests):
-            print(f"\n{'='*30}")
-            print(f"테스트 {i+1}/{num_tests}")
-            print(f"{'='*30}")
+        # 모든 호출을 동시에 시작하고 완료되는 순서대로 일관성 확인
+        tasks = [asyncio.ensure_future(one_call(i)) for i in range(num_tests)]
+        responses = {}
+        seen = Counter()
+        threshold = min(num_tests, EARLY_STOP_MATCHES)
+        
+        for next_done in asyncio.as_completed(tasks):
+            i, result = await next_done
+            responses[i] = result
+            if not early_stop or isinstance(result, Exception):
+                continue
+            seen[_text_digest(result.text.strip())] += 1
+            if len(seen) == 1 and sum(seen.values()) >= threshold and len(responses) < num_tests:
+                print(f"⏹️ 처음 {threshold}회 결과가 모두 동일 - 남은 {num_tests - len(responses)}회 호출 생략")
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                break
+        
+        # 결과는 호출 순서대로 출력
+        for i, result in sorted(responses.items()):
+            # 테스트별 출력은 모아서 한 번에 씀 (세그먼트가 많아도 print 한 번)
+            buf = [f"\n{'='*30}", f"테스트 {i+1}/{num_tests}", f"{'='*30}"]
             
             try:
-                # API 호출 함수 (프롬프트 없이 순수 인식)
-                def call_api():
-                    with open(audio_file_path, "rb") as audio_file:
-                        return client.audio.transcriptions.create(
-                            model="whisper-1",
-                            file=audio_file,
-                            language="ko",  # 한국어 고정
-                            response_format="verbose_json",
-                            timestamp_granularities=["segment"],
-                            temperature=0.0  # 일관성을 위해 0으로 고정
-                            # prompt 사용하지 않음 - 실제 오디오만 인식
-                        )
-                
-                # 비동기 실행
-                result = await asyncio.to_thread(call_api)
+                if isinstance(result, Exception):
+                    raise result
                 
                 transcript_text = result.text.strip()
-                print(f"✅ 결과: '{transcript_text}'")
-                print(f"🌐 언어: {result.language}")
-                print(f"📊 세그먼트: {len(result.segments) if result.segments else 0}개")
+                buf.append(f"✅ 결과: '{transcript_text}'")
+                buf.append(f"🌐 언어: {result.language}")
+                buf.append(f"📊 세그먼트: {len(result.segments) if result.segments else 0}개")
                 
                 # 세그먼트 상세 정보
                 if result.segments:
-                    for j, segment in enumerate(result.segments):
-                        print(f"  └ 세그먼트 {j+1}: [{segment.start:.1f}s-{segment.end:.1f}s] '{segment.text.strip()}'")
+                    buf.extend(
+                        f"  └ 세그먼트 {j+1}: [{segment.start:.1f}s-{segment.end:.1f}s] '{segment.text.strip()}'"
+                        for j, segment in enumerate(result.segments)
+                    )
+                print("\n".join(buf))
                 
                 results.append({
                     'test_num': i+1,
                     'text': transcript_text,
+                    'digest': _text_digest(transcript_text),
                     'language': result.language,
                     'segments': len(result.segments) if result.segments else 0,
                     'success': True
                 })
                 
-                # API 호출 간격 (속도 제한 방지)
-                if i < num_tests - 1:
-                    print("⏳ 1초 대기...")
-                    await asyncio.sleep(1)
-                
             except Exception as e:
-                print(f"❌ 테스트 {i+1} 실패: {str(e)}")
+                buf.append(f"❌ 테스트 {i+1} 실패: {str(e)}")
+                print("\n".join(buf))
                 results.append({
                     'test_num': i+1,
                     'text': f"오류: {str(e)}",
@@ -105,20 +159,22 @@ async def test_api_consistency(audio_file_path: str, num_tests: int = 5):
                 print(f"  {result['test_num']}. '{result['text']}'")
             
             # 결과 빈도 분석
-            texts = [r['text'] for r in successful_results]
-            text_counter = Counter(texts)
+            text_by_digest = {r['digest']: r['text'] for r in successful_results}
+            text_counter = Counter(r['digest'] for r in successful_results)
             
             print(f"\n🎯 결과 빈도 분석:")
-            for text, count in text_counter.most_common():
+            for digest, count in text_counter.most_common():
+                text = text_by_digest[digest]
                 percentage = (count / len(successful_results)) * 100
                 print(f"  '{text}': {count}회 ({percentage:.1f}%)")
             
             # 일관성 평가
             if len(text_counter) == 1:
                 print(f"\n🏆 완벽한 일관성! 모든 결과가 동일합니다.")
-                most_common_text = list(text_counter.keys())[0]
+                most_common_text = successful_results[0]['text']
             else:
-                most_common_text, most_common_count = text_counter.most_common(1)[0]
+                most_common_digest, most_common_count = text_counter.most_common(1)[0]
+                most_common_text = text_by_digest[most_common_digest]
                 consistency_rate = (most_common_count / len(successful_results)) * 100
                 
                 if consistency_rate >= 80:
@@ -148,18 +204,23 @@ async def test_api_consistency(audio_file_path: str, num_tests: int = 5):
         return False
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("사용법: python test_api_consistency.py <audio_file_path> [횟수]")
+    flags = {"--no-cache", "--all"}
+    args = [a for a in sys.argv[1:] if a not in flags]
+    use_cache = "--no-cache" not in sys.argv[1:]
+    early_stop = "--all" not in sys.argv[1:]
+    
+    if len(args) < 1:
+        print("사용법: python test_api_consistency.py <audio_file_path> [횟수] [--no-cache] [--all]")
         sys.exit(1)
     
-    audio_path = sys.argv[1]
-    num_tests = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    audio_path = args[0]
+    num_tests = int(args[1]) if len(args) > 1 else 5
     
     print("🧪 OpenAI Whisper API 일관성 테스트")
     print("="*50)
     
     # 비동기 실행
-    success = asyncio.run(test_api_consistency(audio_path, num_tests))
+    success = run(test_api_consistency(audio_path, num_tests, use_cache=use_cache, early_stop=early_stop))
     
     print("="*50)
     if success:
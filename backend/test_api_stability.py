@@ -6,12 +6,12 @@
 import os
 import sys
 import asyncio
-from dotenv import load_dotenv
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from auto_subtitle.openai_stable_client import stable_openai_whisper_client
+from test_common import run
 
 async def test_api_stability(audio_path: str, test_count: int = 5):
     """안정화된 API 일관성 테스트"""
@@ -32,14 +32,18 @@ async def test_api_stability(audio_path: str, test_count: int = 5):
     print("🎯 1단계: 안정화 모드 테스트 (temperature=0, 상세 프롬프트)")
     print("-" * 50)
     
-    for i in range(test_count):
-        print(f"📡 {i+1}번째 호출...")
-        
-        result = await stable_openai_whisper_client.transcribe_audio_stable(
+    # 모든 호출을 동시에 실행하고 결과는 순서대로 출력
+    responses = await asyncio.gather(*(
+        stable_openai_whisper_client.transcribe_audio_stable(
             audio_path, 
             language="ko",
             use_deterministic=True
         )
+        for _ in range(test_count)
+    ))
+    
+    for i, result in enumerate(responses):
+        print(f"📡 {i+1}번째 호출...")
         
         if result.get("success"):
             text = result["text"]
@@ -82,8 +86,8 @@ async def test_api_stability(audio_path: str, test_count: int = 5):
     
     print(f"\n🏆 일관성 점수: {consistency_score}/100")
     
-    # 2. 재시도 기반 안정화 테스트
-    print(f"\n🔄 2단계: 재시도 기반 안정화 테스트")
+    # 2. 일치 확인 기반 안정화 테스트
+    print(f"\n🔄 2단계: 일치 확인 기반 안정화 테스트")
     print("-" * 50)
     
     retry_result = await stable_openai_whisper_client.transcribe_with_retry(
@@ -92,8 +96,12 @@ async def test_api_stability(audio_path: str, test_count: int = 5):
         max_retries=3
     )
     
-    if retry_result.get("success"):
-        print(f"✅ 재시도 결과: {retry_result['text']}")
+    if retry_result.get("success") and retry_result["majority"]:
+        print(f"✅ 일치 결과: {retry_result['text']} "
+              f"({retry_result['votes']}/{retry_result['vote_total']}회 일치)")
+    elif retry_result.get("success"):
+        print(f"⚠️ 일치하는 결과 없음 - 첫 번째 결과 사용: {retry_result['text']} "
+              f"({retry_result['vote_total']}회 호출)")
     else:
         print(f"❌ 재시도 실패: {retry_result.get('error')}")
     
@@ -107,10 +115,15 @@ async def test_comparison_with_baseline(audio_path: str):
     # 기존 simple API 테스트 (비교용)
     from auto_subtitle.openai_client_simple import openai_whisper_client
     
+    # 기존/안정화 API 3회씩 모두 동시에 호출
+    baseline, stable = await asyncio.gather(
+        asyncio.gather(*(openai_whisper_client.transcribe_audio_api(audio_path, "ko") for _ in range(3))),
+        asyncio.gather(*(stable_openai_whisper_client.transcribe_audio_stable(audio_path, "ko") for _ in range(3)))
+    )
+    
     print("📊 기존 API (3회 테스트):")
     baseline_results = []
-    for i in range(3):
-        result = await openai_whisper_client.transcribe_audio_api(audio_path, "ko")
+    for i, result in enumerate(baseline):
         if result.get("success"):
             baseline_results.append(result["text"])
             print(f"   {i+1}. {result['text']}")
@@ -119,8 +132,7 @@ async def test_comparison_with_baseline(audio_path: str):
     
     print(f"\n📊 안정화 API (3회 테스트):")
     stable_results = []
-    for i in range(3):
-        result = await stable_openai_whisper_client.transcribe_audio_stable(audio_path, "ko")
+    for i, result in enumerate(stable):
         if result.get("success"):
             stable_results.append(result["text"])
             print(f"   {i+1}. {result['text']}")
@@ -169,4 +181,4 @@ async def main():
         print("   → API 모드는 속도가 필요한 경우에만 사용")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
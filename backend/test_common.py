@@ -0,0 +1,356 @@
+"""
+API 테스트 스크립트 공용 헬퍼
+동시 요청을 보내는 테스트들이 같은 HTTP 클라이언트 구성을 사용하도록 모아둠
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import mimetypes
+import os
+import time
+import uuid
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from async_runner import run  # noqa: F401 - 기존 테스트들의 `from test_common import run` 유지
+
+# httpx-aiohttp가 있으면 aiohttp 기반 트랜스포트 사용
+# (기본 httpx 트랜스포트는 동시 요청이 많아질수록 처리량이 떨어짐)
+try:
+    from httpx_aiohttp import AiohttpTransport
+    AIOHTTP_TRANSPORT_AVAILABLE = True
+except ImportError:
+    AIOHTTP_TRANSPORT_AVAILABLE = False
+
+# diskcache가 있으면 교정 결과를 실행 간에도 디스크에 보존
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# aiolimiter가 있으면 그 토큰 버킷 사용 (없으면 아래 _TokenBucket)
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+
+# .env는 테스트 세션에서 한 번만 읽음
+load_dotenv()
+API_KEY = os.getenv("OPENAI_API_KEY")
+API_KEY_CONFIGURED = bool(API_KEY) and API_KEY != "your_openai_api_key_here"
+
+# 동시 테스트 호출용 연결 풀 설정
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+# 음성 파일 업로드/인식은 오래 걸릴 수 있으므로 넉넉하게
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+# 원시 HTTP 요청용 API 주소 (SDK와 같은 환경변수 사용)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+# Whisper API 요청 속도 제한 (요청 수, 기간 초) - 50 RPM 등급 기준
+WHISPER_RATE_LIMIT = (50, 60.0)
+
+# 로컬 Faster-Whisper 테스트 공용 모델 설정
+# 모델 이름 또는 미리 양자화 변환한 CTranslate2 모델 디렉토리
+# 예: ct2-transformers-converter --model openai/whisper-large-v3 \
+#         --quantization int8 --output_dir ./large-v3-int8
+WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR", "large-v3")
+# 실행 장치와 CTranslate2 연산 타입 (auto면 하드웨어에서 가장 빠른 조합 선택
+# - GPU면 float16 계열, AVX512-VNNI CPU면 int8 커널 등)
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "auto")
+WHISPER_COMPUTE = os.getenv("WHISPER_COMPUTE", "auto")
+
+
+def make_http_client() -> httpx.AsyncClient:
+    """동시 요청에 맞춘 httpx 비동기 클라이언트 생성"""
+    if AIOHTTP_TRANSPORT_AVAILABLE:
+        return httpx.AsyncClient(
+            transport=AiohttpTransport(),
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        )
+    return httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+def make_async_client(api_key: str = API_KEY) -> AsyncOpenAI:
+    """공용 HTTP 클라이언트를 사용하는 AsyncOpenAI 생성"""
+    return AsyncOpenAI(api_key=api_key, http_client=make_http_client())
+
+
+class _TokenBucket:
+    """aiolimiter.AsyncLimiter 대체용 최소 토큰 버킷 (async with로 사용)"""
+    
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.rate = max_rate / time_period  # 초당 충전되는 토큰 수
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.max_rate, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def make_rate_limiter(max_rate: float = WHISPER_RATE_LIMIT[0],
+                      time_period: float = WHISPER_RATE_LIMIT[1]):
+    """할당량 안에서는 버스트를 허용하는 토큰 버킷 속도 제한기 (코루틴 안에서 생성)"""
+    if AIOLIMITER_AVAILABLE:
+        return AsyncLimiter(max_rate, time_period)
+    return _TokenBucket(max_rate, time_period)
+
+
+@functools.lru_cache(maxsize=8)
+def read_audio_bytes(path: str) -> bytes:
+    """오디오 파일 내용 (같은 경로는 한 번만 읽어서 모든 호출이 재사용)"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=1)
+def get_whisper_model(model_id: str = WHISPER_MODEL_DIR, **options):
+    """
+    로컬 테스트 공용 Faster-Whisper 모델 (프로세스당 한 번만 로드해서 재사용)
+    장치/연산 타입은 WHISPER_DEVICE/WHISPER_COMPUTE 환경변수로만 변경 (기본 auto)
+    options는 WhisperModel에 그대로 전달 (cpu_threads, num_workers 등)
+    """
+    # API 전용 테스트가 faster-whisper 없이도 test_common을 쓸 수 있도록 필요할 때만 임포트
+    from faster_whisper import WhisperModel
+    
+    print(f"📥 Faster-Whisper 모델 로드 중: {model_id} ({WHISPER_DEVICE}/{WHISPER_COMPUTE})")
+    model = WhisperModel(model_id, device=WHISPER_DEVICE, compute_type=WHISPER_COMPUTE, **options)
+    print("✅ 모델 로드 완료")
+    return model
+
+
+# 이벤트 루프별 공유 클라이언트 (keep-alive 연결을 모든 호출이 재사용)
+_http_client: Optional[httpx.AsyncClient] = None
+_client: Optional[AsyncOpenAI] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _ensure_clients():
+    global _http_client, _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # asyncio.run()마다 루프가 바뀌므로 이전 루프에 묶인 연결 풀은 재사용하지 않음
+    if _client is None or _client_loop is not loop:
+        _http_client = make_http_client()
+        _client = AsyncOpenAI(api_key=API_KEY, http_client=_http_client)
+        _client_loop = loop
+
+
+def get_client() -> AsyncOpenAI:
+    """현재 이벤트 루프에서 공유하는 AsyncOpenAI 반환 (코루틴 안에서 호출)"""
+    _ensure_clients()
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """get_client()와 같은 연결 풀을 쓰는 httpx 클라이언트 (코루틴 안에서 호출)"""
+    _ensure_clients()
+    return _http_client
+
+
+def _encode_multipart(fields: Dict, file: Tuple[str, bytes]) -> Tuple[bytes, str]:
+    """multipart/form-data 본문과 Content-Type 생성 (리스트 값은 name[] 필드로)"""
+    boundary = uuid.uuid4().hex
+    chunks = []
+    for name, value in fields.items():
+        if isinstance(value, (list, tuple)):
+            name, values = f"{name}[]", value
+        else:
+            values = [value]
+        for v in values:
+            chunks.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{v}\r\n'.encode("utf-8")
+            )
+    filename, data = file[0], file[1]
+    file_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    chunks.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: {file_type}\r\n\r\n'.encode("utf-8")
+    )
+    chunks.append(data)
+    chunks.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(chunks), f"multipart/form-data; boundary={boundary}"
+
+
+def prepare_transcription(*, file: Tuple[str, bytes], **params) -> Callable:
+    """같은 전사 요청을 반복 전송하는 비동기 함수 반환
+    
+    multipart 본문은 여기서 한 번만 인코딩하고, 반환된 함수는 그 바이트를
+    공유 연결 풀로 그대로 POST함. 응답은 속성으로 접근 가능한 SimpleNamespace.
+    """
+    body, content_type = _encode_multipart(params, file)
+    headers = {"Authorization": f"Bearer {API_KEY}", "Content-Type": content_type}
+    url = f"{OPENAI_BASE_URL}/audio/transcriptions"
+    
+    async def send():
+        response = await get_http_client().post(url, content=body, headers=headers)
+        response.raise_for_status()
+        return _as_namespace(response.json())
+    return send
+
+
+async def stream_transcription(path: str, **params) -> SimpleNamespace:
+    """파일을 메모리에 올리지 않고 multipart로 스트리밍 업로드해서 전사
+
+    httpx가 파일 객체를 청크 단위로 읽어 전송하므로 큰 파일(최대 25MB)도
+    전체를 바이트로 읽지 않음. 응답은 속성으로 접근 가능한 SimpleNamespace.
+    """
+    data = {
+        (f"{name}[]" if isinstance(value, (list, tuple)) else name): value
+        for name, value in params.items()
+    }
+    filename = os.path.basename(path)
+    file_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    with open(path, "rb") as audio_file:
+        response = await get_http_client().post(
+            f"{OPENAI_BASE_URL}/audio/transcriptions",
+            data=data,
+            files={"file": (filename, audio_file, file_type)},
+            headers={"Authorization": f"Bearer {API_KEY}"}
+        )
+    response.raise_for_status()
+    return _as_namespace(response.json())
+
+
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+class ResultCache:
+    """메모리 LRU + (diskcache가 있으면) 디스크 TTL 캐시"""
+    
+    def __init__(self, name: str, ttl: float, size: int = 1024):
+        self.directory = os.path.join(CACHE_ROOT, name)
+        self.ttl = ttl
+        self.size = size
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._disk = None
+    
+    def _get_disk(self):
+        if self._disk is None and DISKCACHE_AVAILABLE:
+            self._disk = diskcache.Cache(self.directory)
+        return self._disk
+    
+    def _put_memory(self, key: str, value: Dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.size:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            return value
+        disk = self._get_disk()
+        if disk is not None:
+            value = disk.get(key)
+            if value is not None:
+                self._put_memory(key, value)
+        return value
+    
+    def set(self, key: str, value: Dict):
+        self._put_memory(key, value)
+        disk = self._get_disk()
+        if disk is not None:
+            disk.set(key, value, expire=self.ttl)
+
+
+# GPT 교정 결과 캐시 (디스크 보존 7일)
+_correction_cache = ResultCache("gpt", ttl=7 * 24 * 3600)
+
+
+def _correction_key(model: str, system_prompt: str, text: str) -> str:
+    """(모델, 시스템 프롬프트, 텍스트) 조합의 캐시 키"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (model, system_prompt, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cached_correction(model: str, prompt_for: Callable[[str], str]):
+    """correct_text(text, context="", ...) 형태의 비동기 교정 함수에 결과 캐시 적용
+    
+    prompt_for(context)로 실제 시스템 프롬프트를 만들어 키에 포함하므로
+    프롬프트가 바뀌면 이전 결과는 재사용되지 않음. 성공한 결과만 저장.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(text: str, context: str = "", **kwargs) -> Dict:
+            key = _correction_key(model, prompt_for(context), text)
+            cached = _correction_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+            result = await func(text, context, **kwargs)
+            if result.get("success"):
+                _correction_cache.set(key, dict(result))
+            return result
+        return wrapper
+    return decorator
+
+
+# Whisper 전사 결과 캐시 (디스크 보존 30일)
+_transcription_cache = ResultCache("whisper", ttl=30 * 24 * 3600)
+
+
+def _transcription_key(audio_bytes: bytes, params: Dict, call_index: int) -> str:
+    """sha256(오디오) + 요청 파라미터 + 호출 번호 조합의 캐시 키
+    
+    호출 번호를 포함해 반복 호출 테스트를 다시 실행해도
+    처음 측정한 결과 분포(불일치 포함)가 그대로 재현되도록 함
+    """
+    return "|".join((
+        hashlib.sha256(audio_bytes).hexdigest(),
+        json.dumps(params, sort_keys=True, ensure_ascii=False),
+        str(call_index),
+    ))
+
+
+def _as_namespace(value):
+    """캐시된 dict를 API 응답처럼 속성으로 접근할 수 있게 변환"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _as_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_as_namespace(v) for v in value]
+    return value
+
+
+def cached_transcription(create: Callable):
+    """client.audio.transcriptions.create에 결과 캐시 적용
+    
+    file=(이름, bytes) 형태로 호출해야 하며 call_index로 반복 호출을 구분.
+    캐시 적중 시 응답은 같은 속성을 가진 SimpleNamespace로 반환.
+    """
+    @functools.wraps(create)
+    async def wrapper(*, file, call_index: int = 0, **params):
+        key = _transcription_key(file[1], params, call_index)
+        cached = _transcription_cache.get(key)
+        if cached is not None:
+            return _as_namespace(cached)
+        result = await create(file=file, **params)
+        _transcription_cache.set(key, result.model_dump())
+        return result
+    return wrapper
@@ -1,24 +1,146 @@
 """
 GPT 후처리 기능 테스트 스크립트
+사용법: python test_gpt_correction.py [--batch]
+  --batch  OpenAI Batch API로 한 번에 제출 (지연은 길지만 비용 약 50% 절감)
 """
 import asyncio
+import io
+import json
+import re
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from auto_subtitle.gpt_postprocessor import gpt_postprocessor
+from test_common import cached_correction, run
 
-async def test_gpt_correction():
+# 같은 테스트 문장을 반복 실행할 때 API 재호출 없이 이전 교정 결과 사용
+correct_text = cached_correction(
+    "gpt-4o-mini", gpt_postprocessor.get_korean_correction_prompt
+)(gpt_postprocessor.correct_text)
+
+# 테스트 텍스트 (일반적인 한국어 음성 인식 오타들)
+TEST_TEXTS = [
+    "안녕하세요 저는 AI 개발자 입니다. 오늘은 웹개발에 대해서 이야기해보겠습니다.",
+    "이거 정말되나요? 안되는것같은데 뭔가이상해요.",
+    "계시는분들은 다들 잘들리시나요? 소리가잘안나와서 걱정이되네요.",
+    "그런데 이런문제는 어떻게 해결하면되요? 방법을알려주세요.",
+    "웬지 이상한 느낌이 들어서 한번더 확인해보려고 해요."
+]
+
+# 확실한 음성 인식 오타는 GPT 없이 바로 교정 (긴 패턴이 먼저 매칭되도록 정렬)
+KNOWN_CORRECTIONS = {
+    "안되요": "안 돼요",
+    "않되": "안 돼",
+    "되요": "돼요",
+    "웬지": "왠지",
+    "할수있": "할 수 있",
+    "될수있": "될 수 있",
+    "한번더": "한 번 더",
+}
+_KNOWN_CORRECTION_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(KNOWN_CORRECTIONS, key=len, reverse=True))
+)
+# 띄어쓰기가 빠진 것으로 보이는 긴 한글 덩어리
+_UNSPACED_RUN_RE = re.compile(r"[가-힣]{7,}")
+# 이보다 긴 텍스트는 규칙만으로 판단하지 않음
+RULE_ONLY_MAX_LENGTH = 200
+
+# Batch API 상태 확인 간격 (초)
+BATCH_POLL_INTERVAL = 10.0
+
+
+def apply_known_corrections(text: str) -> str:
+    """KNOWN_CORRECTIONS를 한 번의 정규식 스캔으로 적용"""
+    return _KNOWN_CORRECTION_RE.sub(lambda m: KNOWN_CORRECTIONS[m.group(0)], text)
+
+
+def needs_gpt(original: str, rule_corrected: str) -> bool:
+    """규칙 교정만으로 부족해 GPT로 넘겨야 하는 텍스트인지 판단
+    
+    규칙이 아무것도 고치지 못했거나, 길거나, 띄어쓰기 누락이 의심되면 GPT 사용
+    """
+    return (
+        rule_corrected == original
+        or len(rule_corrected) > RULE_ONLY_MAX_LENGTH
+        or _UNSPACED_RUN_RE.search(rule_corrected) is not None
+    )
+
+
+async def correct_with_batch(test_texts: list) -> list:
+    """모든 텍스트를 하나의 Batch API 작업으로 교정 (correct_text와 같은 결과 형식)"""
+    client = gpt_postprocessor.client
+    system_prompt = gpt_postprocessor.get_korean_correction_prompt()
+    
+    # 요청별 JSONL 작성 (custom_id로 결과를 원래 순서에 매핑)
+    lines = []
+    for i, text in enumerate(test_texts):
+        lines.append(json.dumps({
+            "custom_id": f"text-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"다음 텍스트를 교정해주세요:\n\n{text}"}
+                ],
+                "temperature": 0.1,
+                "max_tokens": 2000
+            }
+        }, ensure_ascii=False))
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+    
+    batch_file = await client.files.create(
+        file=("gpt_correction_batch.jsonl", io.BytesIO(payload)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"📦 배치 작업 제출: {batch.id}")
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+        print(f"⏳ 배치 상태: {batch.status}")
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        error = f"배치 작업 실패: {batch.status}"
+        return [{"success": False, "error": error, "original_text": t} for t in test_texts]
+    
+    output = await client.files.content(batch.output_file_id)
+    corrected = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        body = (item.get("response") or {}).get("body") or {}
+        choices = body.get("choices") or []
+        if choices:
+            corrected[item["custom_id"]] = choices[0]["message"]["content"].strip()
+    
+    results = []
+    for i, text in enumerate(test_texts):
+        corrected_text = corrected.get(f"text-{i}")
+        if corrected_text is None:
+            results.append({"success": False, "error": "배치 결과 없음", "original_text": text})
+        else:
+            results.append({
+                "success": True,
+                "corrected_text": corrected_text,
+                "original_text": text,
+                "correction_applied": corrected_text != text
+            })
+    return results
+
+
+async def test_gpt_correction(use_batch: bool = False):
     """GPT 후처리 기능 테스트"""
     
-    # 테스트 텍스트 (일반적인 한국어 음성 인식 오타들)
-    test_texts = [
-        "안녕하세요 저는 AI 개발자 입니다. 오늘은 웹개발에 대해서 이야기해보겠습니다.",
-        "이거 정말되나요? 안되는것같은데 뭔가이상해요.",
-        "계시는분들은 다들 잘들리시나요? 소리가잘안나와서 걱정이되네요.",
-        "그런데 이런문제는 어떻게 해결하면되요? 방법을알려주세요.",
-        "웬지 이상한 느낌이 들어서 한번더 확인해보려고 해요."
-    ]
+    test_texts = TEST_TEXTS
     
     print("🤖 GPT 후처리 테스트 시작...\n")
     
@@ -26,15 +148,44 @@ async def test_gpt_correction():
         print("❌ GPT 후처리를 사용할 수 없습니다. OpenAI API 키를 확인해주세요.")
         return
     
-    for i, text in enumerate(test_texts, 1):
-        print(f"📝 테스트 {i}/5")
+    # 1차: 규칙 기반 교정, 애매한 텍스트만 GPT로 보냄
+    rule_texts = [apply_known_corrections(text) for text in test_texts]
+    results = [
+        {
+            "success": True,
+            "corrected_text": rule_text,
+            "original_text": text,
+            "correction_applied": rule_text != text,
+            "method": "rule"
+        }
+        for text, rule_text in zip(test_texts, rule_texts)
+    ]
+    escalated = [i for i, (text, rule_text) in enumerate(zip(test_texts, rule_texts))
+                 if needs_gpt(text, rule_text)]
+    print(f"⚡ 규칙 교정 완료: {len(test_texts) - len(escalated)}개, GPT 교정 대상: {len(escalated)}개\n")
+    
+    if escalated:
+        gpt_inputs = [rule_texts[i] for i in escalated]
+        if use_batch:
+            gpt_results = await correct_with_batch(gpt_inputs)
+        else:
+            # 텍스트별 교정 요청을 동시에 실행
+            gpt_results = await asyncio.gather(
+                *(correct_text(text) for text in gpt_inputs)
+            )
+        for i, result in zip(escalated, gpt_results):
+            result = dict(result, original_text=test_texts[i], method="gpt")
+            if result["success"]:
+                result["correction_applied"] = result["corrected_text"] != test_texts[i]
+            results[i] = result
+    
+    for i, (text, result) in enumerate(zip(test_texts, results), 1):
+        print(f"📝 테스트 {i}/{len(test_texts)}")
         print(f"원본: {text}")
         
-        result = await gpt_postprocessor.correct_text(text)
-        
         if result["success"]:
             print(f"교정: {result['corrected_text']}")
-            print(f"변경: {'✅ 교정됨' if result['correction_applied'] else '❌ 변경 없음'}")
+            print(f"변경: {'✅ 교정됨' if result['correction_applied'] else '❌ 변경 없음'} ({result['method']})")
         else:
             print(f"오류: {result['error']}")
         
@@ -43,4 +194,4 @@ async def test_gpt_correction():
     print("✅ 테스트 완료!")
 
 if __name__ == "__main__":
-    asyncio.run(test_gpt_correction())
+    run(test_gpt_correction(use_batch="--batch" in sys.argv[1:]))
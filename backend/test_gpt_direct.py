@@ -4,30 +4,25 @@ GPT 후처리 직접 테스트 스크립트
 """
 import sys
 import os
-import asyncio
-from dotenv import load_dotenv
-
-# 환경 변수 로드
-load_dotenv()
 
 # backend 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from phase2_postprocessing import Phase2PostProcessor
+from test_common import API_KEY, API_KEY_CONFIGURED, run
 
 async def test_gpt_correction():
     """직접 GPT 교정 테스트"""
     
     # API 키 확인
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key or api_key == 'your_openai_api_key_here':
+    if not API_KEY_CONFIGURED:
         print("❌ OpenAI API 키가 설정되지 않았습니다.")
         return
     
-    print(f"✅ API 키 설정됨: {api_key[:20]}...")
+    print(f"✅ API 키 설정됨: {API_KEY[:20]}...")
     
     # GPT 후처리기 초기화
-    processor = Phase2PostProcessor(api_key)
+    processor = Phase2PostProcessor(API_KEY)
     print(f"✅ GPT 후처리기 초기화 완료")
     print(f"✅ 사용 가능 여부: {processor.is_available()}")
     
@@ -100,7 +95,7 @@ if __name__ == "__main__":
     print("🧪 GPT-4.1 mini 후처리 직접 테스트 시작 (외래어 표기법 포함)")
     print("=" * 60)
     
-    asyncio.run(test_gpt_correction())
+    run(test_gpt_correction())
     
     print("\\n" + "=" * 60)
     print("🏁 테스트 완료")
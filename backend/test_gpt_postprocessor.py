@@ -2,9 +2,9 @@
 GPT 후처리 모듈 테스트
 한국어 오타 교정 기능을 테스트합니다.
 """
-import asyncio
 import sys
 import os
+from test_common import run
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -86,7 +86,7 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # 비동기 실행
-    asyncio.run(test_gpt_postprocessor())
+    run(test_gpt_postprocessor())
     
     print("=" * 50)
     print("✅ 테스트 완료")
@@ -1,23 +1,17 @@
 """
 GPT 후처리 단독 테스트 (의존성 최소화)
 """
-import asyncio
-import os
 from typing import Dict
-from openai import AsyncOpenAI
-from dotenv import load_dotenv
+from test_common import API_KEY_CONFIGURED, get_client, run
 
 async def test_gpt_correction_simple():
     """간단한 GPT 후처리 테스트"""
     
-    load_dotenv()
-    api_key = os.getenv('OPENAI_API_KEY')
-    
-    if not api_key:
+    if not API_KEY_CONFIGURED:
         print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         return
     
-    client = AsyncOpenAI(api_key=api_key)
+    client = get_client()
     
     # 테스트 텍스트
     test_text = "안녕하세요 저는 AI 개발자 입니다. 이거 정말되나요? 웬지 이상한 느낌이 들어요."
@@ -57,4 +51,4 @@ async def test_gpt_correction_simple():
         print(f"❌ 테스트 실패: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(test_gpt_correction_simple())
+    run(test_gpt_correction_simple())
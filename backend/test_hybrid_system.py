@@ -7,12 +7,37 @@ import os
 import sys
 import asyncio
 from pathlib import Path
+from typing import Dict, Optional
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from faster_whisper import WhisperModel
 from auto_subtitle.openai_client_simple import openai_whisper_client
+from test_common import get_whisper_model, run
+
+
+def _run_local(audio_path: str) -> Dict:
+    """로컬 Faster-Whisper 전사 (블로킹 - 스레드에서 실행)"""
+    model = get_whisper_model()
+    segments, info = model.transcribe(
+        audio_path, 
+        language="ko",
+        task="transcribe",
+        vad_filter=True  # 무음 구간은 디코딩하지 않음
+    )
+    parts = [t for t in (segment.text.strip() for segment in segments) if t]
+    return {
+        "language": info.language,
+        "language_probability": info.language_probability,
+        "parts": parts,
+        "text": " ".join(parts)
+    }
+
+async def _run_api(audio_path: str) -> Optional[Dict]:
+    """OpenAI API 전사 (API 키가 없으면 None)"""
+    if not openai_whisper_client.is_available():
+        return None
+    return await openai_whisper_client.transcribe_audio_api(audio_path, "ko")
 
 async def test_hybrid_system(audio_file_path: str):
     """하이브리드 시스템 전체 테스트"""
@@ -29,25 +54,34 @@ async def test_hybrid_system(audio_file_path: str):
     print(f"📁 파일 정보: {os.path.basename(audio_file_path)} ({file_size/1024:.1f}KB)")
     print()
     
+    # 로컬 추론(CPU/GPU)과 API 호출(네트워크)은 서로 독립적이므로 동시에 실행
+    print("📥 Faster-Whisper 모델 로드 및 로컬/API 전사 동시 실행 중...")
+    local_result, api_result = await asyncio.gather(
+        asyncio.to_thread(_run_local, audio_file_path),
+        _run_api(audio_file_path),
+        return_exceptions=True
+    )
+    print()
+    
     # 1단계: 로컬 모드 테스트
     print("🏠 1단계: 로컬 Faster-Whisper 테스트")
     print("-" * 40)
     
-    local_success = await test_local_mode(audio_file_path)
+    local_success = test_local_mode(local_result)
     print()
     
     # 2단계: OpenAI API 모드 테스트  
     print("🌐 2단계: OpenAI API 모드 테스트")
     print("-" * 40)
     
-    api_success = await test_api_mode(audio_file_path)
+    api_success = test_api_mode(api_result)
     print()
     
-    # 3단계: 하이브리드 로직 테스트
+    # 3단계: 하이브리드 로직 테스트 (위 결과 재사용)
     print("🔄 3단계: 하이브리드 로직 테스트")
     print("-" * 40)
     
-    hybrid_success = await test_hybrid_logic(audio_file_path)
+    hybrid_success = test_hybrid_logic(api_result, local_result)
     print()
     
     # 결과 요약
@@ -59,103 +93,71 @@ async def test_hybrid_system(audio_file_path: str):
     
     return local_success or api_success
 
-async def test_local_mode(audio_path: str) -> bool:
-    """로컬 모드 테스트"""
-    try:
-        print("📥 Faster-Whisper 모델 로드 중...")
-        model = WhisperModel("large-v3", device="cpu", compute_type="int8")
-        print("✅ 모델 로드 완료")
-        
-        print("🎯 로컬 음성 인식 중...")
-        segments, info = model.transcribe(
-            audio_path, 
-            language="ko",
-            task="transcribe"
-        )
-        
-        segments_list = []
-        full_text = ""
-        for segment in segments:
-            text = segment.text.strip()
-            if text:
-                segments_list.append(text)
-                full_text += text + " "
-        
-        print(f"✅ 로컬 전사 완료!")
-        print(f"   언어: {info.language} (확률: {info.language_probability:.2f})")
-        print(f"   텍스트: {full_text.strip()}")
-        print(f"   세그먼트: {len(segments_list)}개")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ 로컬 모드 실패: {e}")
+def test_local_mode(local_result) -> bool:
+    """로컬 모드 결과 확인"""
+    if isinstance(local_result, Exception):
+        print(f"❌ 로컬 모드 실패: {local_result}")
         return False
+    
+    if local_result["parts"]:
+        print("\n".join(f"   └ {text}" for text in local_result["parts"]))
+    
+    print(f"✅ 로컬 전사 완료!")
+    print(f"   언어: {local_result['language']} (확률: {local_result['language_probability']:.2f})")
+    print(f"   텍스트: {local_result['text']}")
+    print(f"   세그먼트: {len(local_result['parts'])}개")
+    
+    return True
 
-async def test_api_mode(audio_path: str) -> bool:
-    """OpenAI API 모드 테스트"""
-    try:
-        if not openai_whisper_client.is_available():
-            print("⚠️ OpenAI API 키가 설정되지 않음")
-            print("💡 .env 파일에 OPENAI_API_KEY 설정 필요")
-            return False
-        
-        print("🌐 OpenAI API 전사 중...")
-        result = await openai_whisper_client.transcribe_audio_api(audio_path, "ko")
-        
-        if result.get("success"):
-            print(f"✅ API 전사 완료!")
-            print(f"   언어: {result.get('language', 'unknown')}")
-            print(f"   텍스트: {result.get('text', '')}")
-            print(f"   세그먼트: {len(result.get('segments', []))}개")
-            print(f"   파일 크기: {result.get('file_size_mb', 0):.1f}MB")
-            return True
-        else:
-            print(f"❌ API 전사 실패: {result.get('error', 'Unknown error')}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ API 모드 실패: {e}")
+def test_api_mode(api_result) -> bool:
+    """OpenAI API 모드 결과 확인"""
+    if isinstance(api_result, Exception):
+        print(f"❌ API 모드 실패: {api_result}")
+        return False
+    
+    if api_result is None:
+        print("⚠️ OpenAI API 키가 설정되지 않음")
+        print("💡 .env 파일에 OPENAI_API_KEY 설정 필요")
+        return False
+    
+    if api_result.get("success"):
+        print(f"✅ API 전사 완료!")
+        print(f"   언어: {api_result.get('language', 'unknown')}")
+        print(f"   텍스트: {api_result.get('text', '')}")
+        print(f"   세그먼트: {len(api_result.get('segments', []))}개")
+        print(f"   파일 크기: {api_result.get('file_size_mb', 0):.1f}MB")
+        return True
+    else:
+        print(f"❌ API 전사 실패: {api_result.get('error', 'Unknown error')}")
         return False
 
-async def test_hybrid_logic(audio_path: str) -> bool:
+def test_hybrid_logic(api_result, local_result) -> bool:
     """하이브리드 로직 테스트 (API 우선, 실패시 로컬 대체)"""
-    try:
-        print("🔄 하이브리드 로직 실행...")
+    print("🔄 하이브리드 로직 실행...")
+    
+    # API 모드 우선
+    if isinstance(api_result, dict):
+        print("   → API 모드 시도...")
         
-        # API 모드 우선 시도
-        if openai_whisper_client.is_available():
-            print("   → API 모드 시도...")
-            api_result = await openai_whisper_client.transcribe_audio_api(audio_path, "ko")
-            
-            if api_result.get("success"):
-                print("   ✅ API 모드 성공!")
-                print(f"   텍스트: {api_result.get('text', '')}")
-                return True
-            else:
-                print(f"   ⚠️ API 모드 실패: {api_result.get('error')}")
-                print("   → 로컬 모드로 자동 대체...")
+        if api_result.get("success"):
+            print("   ✅ API 모드 성공!")
+            print(f"   텍스트: {api_result.get('text', '')}")
+            return True
         else:
-            print("   → API 사용 불가, 로컬 모드로 진행...")
-        
-        # 로컬 모드로 대체
-        print("   → 로컬 모드 실행...")
-        model = WhisperModel("large-v3", device="cpu", compute_type="int8")
-        segments, info = model.transcribe(audio_path, language="ko")
-        
-        full_text = ""
-        for segment in segments:
-            text = segment.text.strip()
-            if text:
-                full_text += text + " "
-        
-        print("   ✅ 로컬 모드 성공!")
-        print(f"   텍스트: {full_text.strip()}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ 하이브리드 로직 실패: {e}")
+            print(f"   ⚠️ API 모드 실패: {api_result.get('error')}")
+            print("   → 로컬 모드로 자동 대체...")
+    else:
+        print("   → API 사용 불가, 로컬 모드로 진행...")
+    
+    # 로컬 모드로 대체 (이미 실행한 로컬 결과 사용)
+    print("   → 로컬 모드 실행...")
+    if isinstance(local_result, Exception):
+        print(f"❌ 하이브리드 로직 실패: {local_result}")
         return False
+    
+    print("   ✅ 로컬 모드 성공!")
+    print(f"   텍스트: {local_result['text']}")
+    return True
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
@@ -163,7 +165,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     audio_path = sys.argv[1]
-    success = asyncio.run(test_hybrid_system(audio_path))
+    success = run(test_hybrid_system(audio_path))
     
     if success:
         print("\n🎉 전체 테스트 성공!")
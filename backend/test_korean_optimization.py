@@ -5,30 +5,46 @@ OpenAI Whisper API 최적화 검증 스크립트
 """
 import os
 import asyncio
-from dotenv import load_dotenv
-from openai import OpenAI
+from test_common import API_KEY_CONFIGURED, get_client, read_audio_bytes, run
 import sys
+from pathlib import Path
 
-# 환경변수 로드
-load_dotenv()
+# 한국어 최적화 프롬프트
+KOREAN_PROMPT = (
+    "다음은 한국어 음성입니다. "
+    "정확한 맞춤법과 자연스러운 띄어쓰기를 사용해 주세요. "
+    "문장 부호를 적절히 사용하고, 구어체 표현을 자연스럽게 변환해 주세요."
+)
+
+async def _transcribe(audio_file_path: str, **params):
+    """공유 클라이언트로 한국어 verbose_json 전사 (파일 내용은 캐시에서 재사용)"""
+    return await get_client().audio.transcriptions.create(
+        model="whisper-1",
+        file=(Path(audio_file_path).name, read_audio_bytes(audio_file_path)),
+        language="ko",  # 한국어 명시적 설정
+        response_format="verbose_json",
+        timestamp_granularities=["segment"],
+        **params
+    )
+
+async def _transcribe_optimized(audio_file_path: str):
+    """개선 후 방식: 한국어 최적화 프롬프트 + 일관성을 위한 낮은 온도"""
+    return await _transcribe(audio_file_path, prompt=KOREAN_PROMPT, temperature=0.0)
 
 async def test_optimized_korean_api(audio_file_path: str):
     """최적화된 한국어 OpenAI Whisper API 테스트"""
     
     # API 키 확인
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or api_key == "your_openai_api_key_here":
+    if not API_KEY_CONFIGURED:
         print("❌ OpenAI API 키가 설정되지 않았습니다.")
-        return False
+        return False, ""
     
-    # OpenAI 클라이언트 초기화
-    client = OpenAI(api_key=api_key)
     print(f"✅ OpenAI 클라이언트 초기화 완료")
     
     # 파일 존재 확인
     if not os.path.exists(audio_file_path):
         print(f"❌ 오디오 파일을 찾을 수 없습니다: {audio_file_path}")
-        return False
+        return False, ""
     
     file_size = os.path.getsize(audio_file_path)
     print(f"📁 파일 정보: {os.path.basename(audio_file_path)} ({file_size/1024:.1f}KB)")
@@ -36,29 +52,7 @@ async def test_optimized_korean_api(audio_file_path: str):
     try:
         print("🎯 최적화된 한국어 OpenAI Whisper API 전사 시작...")
         
-        # 한국어 최적화 프롬프트
-        korean_prompt = (
-            "다음은 한국어 음성입니다. "
-            "정확한 맞춤법과 자연스러운 띄어쓰기를 사용해 주세요. "
-            "문장 부호를 적절히 사용하고, 구어체 표현을 자연스럽게 변환해 주세요."
-        )
-        
-        # API 호출을 별도 함수로 분리
-        def call_optimized_api():
-            with open(audio_file_path, "rb") as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ko",  # 한국어 명시적 설정
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment"],
-                    prompt=korean_prompt,  # 🆕 한국어 최적화 프롬프트
-                    temperature=0.0  # 🆕 일관성을 위한 낮은 온도
-                )
-                return transcript
-        
-        # 비동기 실행
-        result = await asyncio.to_thread(call_optimized_api)
+        result = await _transcribe_optimized(audio_file_path)
         
         print("✅ 최적화된 API 전사 완료!")
         print(f"🌐 감지된 언어: {result.language}")
@@ -67,11 +61,12 @@ async def test_optimized_korean_api(audio_file_path: str):
         
         # 세그먼트 정보 상세 출력
         if result.segments:
-            print("\n📋 세그먼트 상세 정보:")
+            buf = ["\n📋 세그먼트 상세 정보:"]
             for i, segment in enumerate(result.segments):
                 start_time = f"{int(segment.start//60)}:{int(segment.start%60):02d}"
                 end_time = f"{int(segment.end//60)}:{int(segment.end%60):02d}"
-                print(f"  {i+1}. [{start_time}-{end_time}] {segment.text}")
+                buf.append(f"  {i+1}. [{start_time}-{end_time}] {segment.text}")
+            print("\n".join(buf))
         
         # 비용 계산
         duration_seconds = result.duration if hasattr(result, 'duration') else 0
@@ -87,51 +82,49 @@ async def test_optimized_korean_api(audio_file_path: str):
         print(f"❌ 최적화된 API 호출 실패: {str(e)}")
         return False, ""
 
-async def compare_before_after(audio_file_path: str):
-    """개선 전후 비교 테스트"""
+async def compare_before_after(audio_file_path: str, improved_text: str = None):
+    """개선 전후 비교 테스트
     
-    api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    improved_text를 넘기면(이미 최적화 전사를 실행한 경우) 기본 방식만 호출,
+    아니면 두 방식을 동시에 호출
+    """
     
     print("🔄 개선 전후 비교 테스트")
     print("="*60)
     
     try:
-        # 1. 개선 전 방식 (기본 설정)
-        print("1️⃣ 개선 전 방식 (기본 설정)")
-        with open(audio_file_path, "rb") as audio_file:
-            basic_result = await asyncio.to_thread(
-                lambda: client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ko",
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment"]
-                )
+        if improved_text is None:
+            basic_result, improved_result = await asyncio.gather(
+                _transcribe(audio_file_path),
+                _transcribe_optimized(audio_file_path)
             )
+            improved_text = improved_result.text
+        else:
+            basic_result = await _transcribe(audio_file_path)
         
+        # 1. 개선 전 방식 (기본 설정)
+        print("1️⃣ 개선 전 방식 (기본 설정)")
         print(f"📝 기본 결과: {basic_result.text}")
         print()
         
         # 2. 개선 후 방식 (최적화 설정)
         print("2️⃣ 개선 후 방식 (한국어 최적화)")
-        success, improved_text = await test_optimized_korean_api(audio_file_path)
+        print(f"📝 최적화 결과: {improved_text}")
+        
+        print()
+        
+        # 3. 결과 비교
+        print("🔍 결과 비교:")
+        print(f"개선 전: '{basic_result.text}'")
+        print(f"개선 후: '{improved_text}'")
         
-        if success:
-            print()
-            
-            # 3. 결과 비교
-            print("🔍 결과 비교:")
-            print(f"개선 전: '{basic_result.text}'")
-            print(f"개선 후: '{improved_text}'")
-            
-            # 품질 평가
-            if len(basic_result.text) > len(improved_text) * 3:
-                print("🎯 개선 후 결과가 더 간결하고 정확합니다!")
-            elif basic_result.text.strip() == improved_text.strip():
-                print("⚡ 결과가 동일합니다.")
-            else:
-                print("🔄 결과가 다릅니다. 수동 확인이 필요합니다.")
+        # 품질 평가
+        if len(basic_result.text) > len(improved_text) * 3:
+            print("🎯 개선 후 결과가 더 간결하고 정확합니다!")
+        elif basic_result.text.strip() == improved_text.strip():
+            print("⚡ 결과가 동일합니다.")
+        else:
+            print("🔄 결과가 다릅니다. 수동 확인이 필요합니다.")
         
         return True
         
@@ -150,12 +143,13 @@ if __name__ == "__main__":
     print("="*60)
     
     # 최적화된 API 테스트
-    success1 = asyncio.run(test_optimized_korean_api(audio_path))
+    success1 = run(test_optimized_korean_api(audio_path))
     
     print("\n" + "="*60)
     
     # 개선 전후 비교
-    success2 = asyncio.run(compare_before_after(audio_path))
+    # 위에서 얻은 최적화 결과를 재사용해 같은 전사를 다시 요청하지 않음
+    success2 = run(compare_before_after(audio_path, success1[1] if success1[0] else None))
     
     print("="*60)
     if success1[0] and success2:
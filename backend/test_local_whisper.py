@@ -5,102 +5,215 @@ pydub 없이 직접 테스트
 """
 import os
 import sys
-import subprocess
 from pathlib import Path
+from typing import List
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from faster_whisper import WhisperModel
+# CTranslate2/OpenMP 스레드 수 (기본: 논리 코어의 절반 ≈ 물리 코어 수)
+# faster_whisper 임포트 전에 설정해야 OpenMP에 반영됨
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 2) // 2)))
+CPU_THREADS = int(os.environ["OMP_NUM_THREADS"])
+# 동시에 transcribe()를 호출할 수 있는 모델 워커 수 (워커마다 메모리 추가 사용)
+NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+# QUALITY=high면 빔 서치(5), 기본은 그리디 디코딩(디코더 연산 약 1/5)
+HIGH_QUALITY = os.getenv("QUALITY", "").lower() == "high"
+BEAM_SIZE = 5 if HIGH_QUALITY else 1
+# 반복/환각이 감지되면 높은 온도로 다시 디코딩 (그리디에서도 복구 가능)
+TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
 
-def test_local_whisper(audio_file_path: str):
-    """로컬 Faster-Whisper 직접 테스트"""
+import numpy as np
+from faster_whisper import BatchedInferencePipeline
+from faster_whisper.audio import decode_audio
+from test_common import get_whisper_model
+
+# soundfile(libsndfile)이 있으면 wav/flac 등은 PyAV 리샘플링 없이 바로 읽음
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# Whisper 입력 샘플레이트
+SAMPLE_RATE = 16000
+# 디코딩한 배열을 원본 옆에 저장하는 캐시 파일 접미사 (다음 실행은 np.load로 바로 매핑)
+DECODED_CACHE_SUFFIX = ".16k.npy"
+
+# 한국어 최적화 프롬프트
+# (BatchedInferencePipeline은 initial_prompt를 내부에서 tokenizer.encode()로 인코딩하므로 토큰 ID가 아닌 문자열로 전달)
+KOREAN_PROMPT = "안녕하세요. 다음은 한국어 음성입니다. 정확한 문장 부호와 자연스러운 띄어쓰기를 포함해 주세요."
+
+# 한 번의 인코더/디코더 호출로 묶어 처리할 VAD 구간 수
+BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+# 디렉토리 인자에서 수집할 오디오 확장자
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm", ".mp4"}
+
+def _get_model():
+    """공용 Whisper 모델 (한 번만 로드해서 여러 파일/--repl 입력에 재사용)"""
+    return get_whisper_model(cpu_threads=CPU_THREADS, num_workers=NUM_WORKERS)
+
+def load_audio(audio_file_path: str) -> np.ndarray:
+    """오디오를 16kHz 모노 float32 배열로 로드 (transcribe에는 배열을 전달)
+    
+    원본보다 새 .16k.npy 캐시가 있으면 디코딩 없이 메모리 매핑으로 읽고,
+    없으면 디코딩 후 캐시 저장 (저장 실패는 무시)
+    """
+    cache_path = audio_file_path + DECODED_CACHE_SUFFIX
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(audio_file_path):
+        return np.load(cache_path, mmap_mode="r")
+    
+    audio = _decode_audio(audio_file_path)
+    try:
+        np.save(cache_path, audio.astype(np.float32, copy=False))
+    except OSError as e:
+        print(f"⚠️ 디코딩 캐시 저장 실패: {e}")
+    return audio
+
+def _decode_audio(audio_file_path: str) -> np.ndarray:
+    """16kHz 파일은 soundfile로 바로 읽고, 그 외 형식/샘플레이트는 faster-whisper의 디코더 사용"""
+    if SOUNDFILE_AVAILABLE:
+        try:
+            wav, sr = sf.read(audio_file_path, dtype="float32")
+        except RuntimeError:  # libsndfile이 지원하지 않는 형식
+            wav, sr = None, None
+        if sr == SAMPLE_RATE:
+            return wav.mean(axis=1) if wav.ndim == 2 else wav
+    return decode_audio(audio_file_path, sampling_rate=SAMPLE_RATE)
+
+def _format_time(seconds: float) -> str:
+    """초를 m:ss 형식으로 (divmod 한 번)"""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}:{secs:02d}"
+
+def collect_audio_paths(args: List[str]) -> List[str]:
+    """인자로 받은 파일/디렉토리에서 오디오 파일 목록 생성 (디렉토리는 확장자로 필터)"""
+    paths = []
+    for arg in args:
+        path = Path(arg)
+        if path.is_dir():
+            paths.extend(
+                str(p) for p in sorted(path.iterdir())
+                if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS
+            )
+        else:
+            paths.append(arg)
+    return paths
+
+def test_local_whisper(audio_file_paths: List[str]):
+    """로컬 Faster-Whisper 직접 테스트 (여러 파일은 모델 한 번 로드 후 순서대로 처리)"""
     
     # 파일 존재 확인
-    if not os.path.exists(audio_file_path):
-        print(f"❌ 오디오 파일을 찾을 수 없습니다: {audio_file_path}")
+    missing = [p for p in audio_file_paths if not os.path.exists(p)]
+    if missing:
+        for audio_file_path in missing:
+            print(f"❌ 오디오 파일을 찾을 수 없습니다: {audio_file_path}")
+        return False
+    if not audio_file_paths:
+        print("❌ 테스트할 오디오 파일이 없습니다")
         return False
-    
-    file_size = os.path.getsize(audio_file_path)
-    print(f"📁 파일 정보: {os.path.basename(audio_file_path)} ({file_size/1024:.1f}KB)")
     
     try:
-        print("📥 Faster-Whisper 모델 로드 중: large-v3")
+        model = _get_model()
         
-        # CPU 모드로 안전하게 로드
-        model = WhisperModel(
-            "large-v3", 
-            device="cpu", 
-            compute_type="int8"
-        )
-        print("✅ 모델 로드 완료")
+        # VAD로 나눈 구간들을 BATCH_SIZE개씩 묶어 한 번에 인코딩/디코딩
+        batched = BatchedInferencePipeline(model=model)
         
-        # 한국어 최적화 프롬프트
-        korean_prompt = "안녕하세요. 다음은 한국어 음성입니다. 정확한 문장 부호와 자연스러운 띄어쓰기를 포함해 주세요."
+        return all([
+            _transcribe_file(batched, audio_file_path)
+            for audio_file_path in audio_file_paths
+        ])
+        
+    except Exception as e:
+        print(f"❌ 로컬 전사 실패: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def _transcribe_file(batched: BatchedInferencePipeline, audio_file_path: str) -> bool:
+    """파일 하나를 배치 파이프라인으로 전사하고 결과 출력"""
+    
+    file_size = os.path.getsize(audio_file_path)
+    print(f"\n📁 파일 정보: {os.path.basename(audio_file_path)} ({file_size/1024:.1f}KB)")
+    
+    try:
+        audio = load_audio(audio_file_path)
+        print(f"🎵 오디오 로드 완료: {len(audio) / SAMPLE_RATE:.1f}초")
         
         print("🎯 한국어 음성 인식 시작...")
         
-        segments, info = model.transcribe(
-            audio_file_path, 
+        # 배치 처리에서는 구간들이 동시에 디코딩되므로 이전 텍스트 조건(condition_on_previous_text) 없음
+        segments, info = batched.transcribe(
+            audio, 
             language="ko",
             task="transcribe",
             word_timestamps=True,
-            initial_prompt=korean_prompt,
-            beam_size=5,
-            best_of=5,
-            temperature=0.0,
-            condition_on_previous_text=True,
+            initial_prompt=KOREAN_PROMPT,
+            beam_size=BEAM_SIZE,
+            best_of=BEAM_SIZE,
+            temperature=TEMPERATURE_FALLBACK,
             compression_ratio_threshold=2.4,
             log_prob_threshold=-1.0,
-            no_speech_threshold=0.6
+            no_speech_threshold=0.6,
+            # Silero VAD로 무음 구간을 잘라내 인코더/디코더 연산과 환각 반복을 줄임
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500),
+            batch_size=BATCH_SIZE
         )
         
-        # 결과 수집
-        segments_list = []
-        full_text = ""
+        # 세그먼트는 디코딩되는 대로 바로 출력하고, 전체 텍스트는 마지막에 한 번만 합침
+        print("\n📋 세그먼트:")
+        parts = []
         
         for segment in segments:
             cleaned_text = segment.text.strip()
             if cleaned_text:
-                segment_dict = {
-                    "start": segment.start,
-                    "end": segment.end,
-                    "text": cleaned_text
-                }
-                segments_list.append(segment_dict)
-                full_text += cleaned_text + " "
+                parts.append(cleaned_text)
+                sys.stdout.write(
+                    f"  {len(parts)}. [{_format_time(segment.start)}-{_format_time(segment.end)}] {cleaned_text}\n"
+                )
+                sys.stdout.flush()
         
         print("✅ 로컬 음성 인식 완료!")
         print(f"🌐 감지된 언어: {info.language} (확률: {info.language_probability:.2f})")
-        print(f"📝 전사 텍스트: {full_text.strip()}")
-        print(f"📊 세그먼트 수: {len(segments_list)}")
-        
-        # 세그먼트 정보 출력 (처음 3개만)
-        if segments_list:
-            print("\n📋 세그먼트 미리보기 (처음 3개):")
-            for i, segment in enumerate(segments_list[:3]):
-                start_time = f"{int(segment['start']//60)}:{int(segment['start']%60):02d}"
-                end_time = f"{int(segment['end']//60)}:{int(segment['end']%60):02d}"
-                print(f"  {i+1}. [{start_time}-{end_time}] {segment['text']}")
+        print(f"📝 전사 텍스트: {' '.join(parts)}")
+        print(f"📊 세그먼트 수: {len(parts)}")
         
         return True
         
     except Exception as e:
-        print(f"❌ 로컬 전사 실패: {str(e)}")
+        print(f"❌ 로컬 전사 실패 ({os.path.basename(audio_file_path)}): {str(e)}")
         import traceback
         traceback.print_exc()
         return False
 
+def repl():
+    """모델을 메모리에 유지한 채 표준 입력에서 파일 경로를 한 줄씩 받아 전사"""
+    _get_model()
+    print("⌨️ 오디오 파일/디렉토리 경로를 입력하세요 (종료: 빈 줄 또는 Ctrl+D)")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            break
+        success = test_local_whisper(collect_audio_paths([line]))
+        print(f"{'🎉 성공' if success else '💥 실패'}: {line}")
+        print("="*50)
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("사용법: python test_local_whisper.py <audio_file_path>")
+    if len(sys.argv) < 2:
+        print("사용법: python test_local_whisper.py <audio_file_or_dir> [...] | --repl")
         sys.exit(1)
     
-    audio_path = sys.argv[1]
     print("🏠 로컬 Faster-Whisper 테스트 시작")
     print("="*50)
     
-    success = test_local_whisper(audio_path)
+    if sys.argv[1] == "--repl":
+        repl()
+        sys.exit(0)
+    
+    audio_paths = collect_audio_paths(sys.argv[1:])
+    
+    success = test_local_whisper(audio_paths)
     
     print("="*50)
     if success:
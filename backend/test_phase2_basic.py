@@ -4,38 +4,41 @@
 - 핵심 기능만 테스트
 """
 
-import asyncio
 import os
 import sys
+import asyncio
 import time
+import importlib
+import importlib.util
 from pathlib import Path
 
 # 프로젝트 루트로 경로 추가
 sys.path.append(str(Path(__file__).parent))
 
 from dotenv import load_dotenv
+from async_runner import run
 
+# 임포트 테스트 대상 모듈
+PHASE2_MODULES = ("phase2_models", "phase2_quality", "phase2_streaming")
 
 async def test_basic_imports():
-    """기본 모듈 임포트 테스트"""
+    """기본 모듈 임포트 테스트 (find_spec으로 모듈 존재부터 확인한 뒤 실제 임포트)"""
     print("📦 모듈 임포트 테스트...")
     
-    try:
-        from phase2_models import Phase2ModelManager, TranscriptionResult
-        print("✅ phase2_models 임포트 성공")
-        
-        from phase2_quality import QualityAnalyzer, KoreanTextAnalyzer
-        print("✅ phase2_quality 임포트 성공")
-        
-        # phase2_streaming은 pydub 없이도 작동하도록 수정됨
-        from phase2_streaming import StreamingTranscriber
-        print("✅ phase2_streaming 임포트 성공")
+    for name in PHASE2_MODULES:
+        if importlib.util.find_spec(name) is None:
+            print(f"❌ 모듈 임포트 실패: {name} 모듈을 찾을 수 없습니다")
+            return False
         
-        return True
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"❌ 모듈 임포트 실패: {e}")
+            return False
         
-    except ImportError as e:
-        print(f"❌ 모듈 임포트 실패: {e}")
-        return False
+        print(f"✅ {name} 임포트 성공")
+    
+    return True
 
 
 async def test_openai_connection():
@@ -186,29 +189,37 @@ async def run_basic_tests():
     print("🧪 Phase 2 기본 테스트 시작")
     print("=" * 50)
     
-    results = []
-    
-    # 1. 모듈 임포트 테스트
-    results.append(await test_basic_imports())
+    outcomes = {}
+    # 로컬 테스트는 출력이 섞이지 않도록 순서대로 실행
+    for name, test in (
+        ("모듈 임포트", test_basic_imports),    # 1. 모듈 임포트 테스트
+        ("품질 분석", test_quality_analyzer),   # 3. 품질 분석기 테스트
+        ("모델 매니저", test_model_manager),    # 4. 모델 매니저 테스트
+    ):
+        try:
+            outcomes[name] = await test()
+        except Exception as e:
+            outcomes[name] = e
     
-    # 2. OpenAI 연결 테스트
-    results.append(await test_openai_connection())
+    # 네트워크 확인 두 개만 동시에 실행 (API 서버 응답 대기 중에 OpenAI 연결 확인)
+    outcomes["OpenAI 연결"], outcomes["API 서버"] = await asyncio.gather(
+        test_openai_connection(),   # 2. OpenAI 연결 테스트
+        test_api_server_status(),   # 5. API 서버 상태 확인 (선택적)
+        return_exceptions=True
+    )
     
-    # 3. 품질 분석기 테스트
-    results.append(await test_quality_analyzer())
-    
-    # 4. 모델 매니저 테스트
-    results.append(await test_model_manager())
-    
-    # 5. API 서버 상태 확인 (선택적)
-    server_status = await test_api_server_status()
+    # 예외로 끝난 테스트는 일반 실패와 구분되도록 이름과 함께 출력
+    test_names = ["모듈 임포트", "OpenAI 연결", "품질 분석", "모델 매니저", "API 서버"]
+    for name in test_names:
+        if isinstance(outcomes[name], BaseException):
+            print(f"\n💥 {name} 테스트 중 예외 발생: {type(outcomes[name]).__name__}: {outcomes[name]}")
+    results = [outcomes[name] is True for name in test_names[:-1]]
+    server_status = outcomes["API 서버"] is True
     
     # 결과 요약
     print("\n📊 테스트 결과 요약")
     print("=" * 50)
     
-    test_names = ["모듈 임포트", "OpenAI 연결", "품질 분석", "모델 매니저"]
-    
     for i, (name, result) in enumerate(zip(test_names, results)):
         status = "✅ 성공" if result else "❌ 실패"
         print(f"{i+1}. {name}: {status}")
@@ -244,7 +255,7 @@ if __name__ == "__main__":
     print("")
     
     try:
-        asyncio.run(run_basic_tests())
+        run(run_basic_tests())
     except KeyboardInterrupt:
         print("\n\n🛑 테스트가 중단되었습니다.")
     except Exception as e:
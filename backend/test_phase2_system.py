@@ -4,9 +4,9 @@
 - 오류 검증 및 디버깅
 """
 
-import asyncio
 import os
 import sys
+import asyncio
 import tempfile
 from pathlib import Path
 
@@ -23,6 +23,7 @@ except ImportError as e:
     sys.exit(1)
 
 from dotenv import load_dotenv
+from async_runner import run
 
 
 def create_test_audio():
@@ -163,34 +164,37 @@ async def test_api_server():
     try:
         import httpx
         
-        # API 서버 상태 확인
-        async with httpx.AsyncClient() as client:
-            # 기본 엔드포인트 테스트
-            response = await client.get("http://localhost:8002/")
-            if response.status_code == 200:
-                print("✅ 메인 엔드포인트 접속 성공")
-            else:
-                print(f"❌ 메인 엔드포인트 접속 실패: {response.status_code}")
-                return False
-            
-            # API 상태 확인
-            response = await client.get("http://localhost:8002/api-status")
-            if response.status_code == 200:
-                data = response.json()
-                print("✅ API 상태 확인 성공")
-                print(f"  Phase 2 사용 가능: {data.get('phase2_available', False)}")
-            else:
-                print(f"❌ API 상태 확인 실패: {response.status_code}")
-                return False
-            
-            # 모델 정보 확인
-            response = await client.get("http://localhost:8002/models")
-            if response.status_code == 200:
-                data = response.json()
-                print("✅ 모델 정보 확인 성공")
-                print(f"  사용 가능한 모델: {data.get('total_count', 0)}개")
-            else:
-                print(f"❌ 모델 정보 확인 실패: {response.status_code}")
+        # API 서버 상태 확인 (세 엔드포인트를 동시에 요청)
+        async with httpx.AsyncClient(base_url="http://localhost:8002") as client:
+            main_response, status_response, models_response = await asyncio.gather(
+                client.get("/"),
+                client.get("/api-status"),
+                client.get("/models")
+            )
+        
+        # 기본 엔드포인트 테스트
+        if main_response.status_code == 200:
+            print("✅ 메인 엔드포인트 접속 성공")
+        else:
+            print(f"❌ 메인 엔드포인트 접속 실패: {main_response.status_code}")
+            return False
+        
+        # API 상태 확인
+        if status_response.status_code == 200:
+            data = status_response.json()
+            print("✅ API 상태 확인 성공")
+            print(f"  Phase 2 사용 가능: {data.get('phase2_available', False)}")
+        else:
+            print(f"❌ API 상태 확인 실패: {status_response.status_code}")
+            return False
+        
+        # 모델 정보 확인
+        if models_response.status_code == 200:
+            data = models_response.json()
+            print("✅ 모델 정보 확인 성공")
+            print(f"  사용 가능한 모델: {data.get('total_count', 0)}개")
+        else:
+            print(f"❌ 모델 정보 확인 실패: {models_response.status_code}")
         
         print("\n🏆 API 서버 테스트 완료!")
         return True
@@ -246,7 +250,7 @@ if __name__ == "__main__":
     print("")
     
     try:
-        asyncio.run(run_all_tests())
+        run(run_all_tests())
     except KeyboardInterrupt:
         print("\n\n🛑 테스트가 중단되었습니다.")
     except Exception as e: